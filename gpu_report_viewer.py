@@ -10,33 +10,61 @@ Usage:
     python3 gpu_report_viewer.py gpu_report_XXXX.json  # direct file
 """
 
+import io
 import os
 import sys
 import json
-import glob
+import re
 import math
+import mmap
+import bisect
+import warnings
 import datetime
-import statistics
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# NumPy costs ~0.1 s of import time, paid back on any report past a few
+# thousand snapshots by the vectorized stats and render paths
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.text import Text
-    from rich.align import Align
-    from rich import box
+    import ijson
 except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "rich", "-q"])
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.text import Text
-    from rich.align import Align
-    from rich import box
+    ijson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+from rich.console import Console, Group
+from rich.table import Table
+from rich.panel import Panel
+from rich.text import Span, Text
+from rich.align import Align
+from rich import box
+
+
+# Shared Console, created by main() or on first use rather than at import
+console = None
+
 
+def _get_console():
+    global console
+    if console is None:
+        console = Console()
+    return console
 
-console = Console()
 
 # ─────────────────────── HELPERS ──────────────────────────────
 
@@ -54,40 +82,127 @@ MODE_LABELS = {
 
 
 def _fmt_duration(seconds):
-    return str(datetime.timedelta(seconds=int(seconds)))
+    # Truncate first so every float variant of a second shares one cache slot
+    return _fmt_whole_seconds(int(seconds))
 
 
-def _sparkline_rich(values, width=None):
-    """Generate a full-width Rich Text sparkline with color gradient."""
-    if not values:
-        return Text("")
-    if width is None:
-        width = max(console.size.width - 10, 40)
-    mn, mx = min(values), max(values)
-    span = mx - mn if mx != mn else 1
-    blocks = " ▁▂▃▄▅▆▇█"
-
-    if len(values) > width:
-        step = len(values) / width
-        sampled = [values[int(i * step)] for i in range(width)]
-    else:
-        sampled = values
-
-    line = Text()
-    for v in sampled:
-        ratio = (v - mn) / span
-        idx = int(ratio * (len(blocks) - 1))
-        # Color gradient: cyan → green → yellow → red
-        if ratio >= 0.85:
-            style = "bold red"
-        elif ratio >= 0.65:
-            style = "yellow"
-        elif ratio >= 0.35:
-            style = "green"
+@lru_cache(maxsize=1024)
+def _fmt_whole_seconds(seconds):
+    return str(datetime.timedelta(seconds=seconds))
+
+
+_SPARK_BLOCKS = tuple(" ▁▂▃▄▅▆▇█")
+_SPARK_CHARS = np.array(_SPARK_BLOCKS)
+# Color gradient: cyan → green → yellow → red, by ratio within [min, max]
+_SPARK_LIMITS = (0.35, 0.65, 0.85)
+_SPARK_STYLES = ("cyan", "green", "yellow", "bold red")
+
+
+def _run_lengths_numpy(bins):
+    """Split a bucket array into runs of equal values: (run_lengths, run_bins)."""
+    if not len(bins):
+        return np.empty(0, dtype=np.int32), bins[:0]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bins)) + 1))
+    return np.diff(np.append(starts, len(bins))), bins[starts]
+
+
+def _run_lengths_loop(bins):
+    """Loop form of _run_lengths_numpy, for numba to compile."""
+    lengths = np.empty(len(bins), dtype=np.int32)
+    values = np.empty_like(bins)
+    k = 0
+    for i in range(len(bins)):
+        if k > 0 and values[k - 1] == bins[i]:
+            lengths[k - 1] += 1
+        else:
+            values[k] = bins[i]
+            lengths[k] = 1
+            k += 1
+    return lengths[:k], values[:k]
+
+
+_run_lengths = njit(cache=True)(_run_lengths_loop) if njit is not None else _run_lengths_numpy
+
+
+def _text_from_runs(pieces, run_styles):
+    """Build one Text from consecutive string pieces and their styles in a single construction."""
+    spans = []
+    start = 0
+    for piece, style in zip(pieces, run_styles):
+        end = start + len(piece)
+        spans.append(Span(start, end, style))
+        start = end
+    return Text("".join(pieces), spans=spans)
+
+
+def _runs_text(chars, buckets, styles):
+    """Style the string chars with one span per run of equal style buckets."""
+    lengths, run_bins = _run_lengths(np.asarray(buckets))
+    ends = np.cumsum(lengths).tolist()
+    starts = [0] + ends[:-1]
+    return _text_from_runs(
+        [chars[a:b] for a, b in zip(starts, ends)],
+        [styles[b] for b in run_bins.tolist()],
+    )
+
+
+@lru_cache(maxsize=64)
+def _sample_indices(n, width):
+    """Evenly spaced indices picking width of n samples, always including the first and last.
+
+    Shared by every series of the same length, so it is read-only.
+    """
+    picks = np.linspace(0, n - 1, width).astype(np.intp)
+    picks.flags.writeable = False
+    return picks
+
+
+@lru_cache(maxsize=None)
+def make_sparkline(width, limits=_SPARK_LIMITS, styles=_SPARK_STYLES):
+    """Sparkline builder specialized for one width and color scheme.
+
+    Width and colors are fixed for a whole run, so the bucket table is built
+    once per (width, limits, styles) and reused for every series of every GPU.
+    """
+    limits = np.asarray(limits, dtype=np.float64)
+    top = len(_SPARK_BLOCKS) - 1
+
+    def sparkline(values, bounds=None):
+        if not len(values):
+            return Text("")
+        if len(values) > width:
+            picks = _sample_indices(len(values), width)
+            if isinstance(values, np.ndarray):
+                arr = values[picks].astype(np.float64)
+            else:
+                # Plain sequences: gather only the sampled items instead of converting all of them
+                arr = np.fromiter(map(values.__getitem__, picks.tolist()), dtype=np.float64, count=width)
         else:
-            style = "cyan"
-        line.append(blocks[idx], style=style)
-    return line
+            arr = np.asarray(values, dtype=np.float64)
+
+        if bounds is None:
+            bounds = (np.min(values), np.max(values))
+        mn, mx = float(bounds[0]), float(bounds[1])
+        span = mx - mn if mx != mn else 1
+        ratio = (arr - mn) / span
+        idx = (ratio * top).astype(np.intp)
+        buckets = np.searchsorted(limits, ratio, side="right")
+
+        chars = "".join(_SPARK_CHARS[idx].tolist())
+        return _runs_text(chars, buckets, styles)
+
+    return sparkline
+
+
+def _sparkline_rich(values, width=None, bounds=None):
+    """Generate a full-width Rich Text sparkline with color gradient.
+
+    bounds is an optional (min, max) pair; pass the reduced stats to skip
+    a second scan of the full series.
+    """
+    if width is None:
+        width = max(_get_console().size.width - 10, 40)
+    return make_sparkline(width)(values, bounds)
 
 
 def _big_bar(value, maximum, width=40, label=""):
@@ -110,62 +225,387 @@ def _big_bar(value, maximum, width=40, label=""):
     return f"[{color}]{'█' * filled}[/{color}][dim]{'░' * empty}[/dim] {pct:.0f}% {label}"
 
 
+_TEMP_BUCKETS = (60, 70, 80, 90)
+_TEMP_STYLES = ("cyan", "green", "dark_orange", "yellow", "bold red")
+
+
+@lru_cache(maxsize=256)
 def _temp_color(temp_c):
-    if temp_c >= 90:
-        return "bold red"
-    if temp_c >= 80:
-        return "yellow"
-    if temp_c >= 70:
-        return "dark_orange"
-    if temp_c >= 60:
-        return "green"
-    return "cyan"
+    return _TEMP_STYLES[bisect.bisect_right(_TEMP_BUCKETS, temp_c)]
 
 
-def _safe_stdev(values):
-    if len(values) < 2:
-        return 0.0
-    return statistics.stdev(values)
+def _fmt_iso(value):
+    """Format an ISO timestamp as dd/mm/YYYY HH:MM:SS, passing anything else through."""
+    try:
+        return datetime.datetime.fromisoformat(value).strftime("%d/%m/%Y %H:%M:%S")
+    except (TypeError, ValueError):
+        return value
 
 
-# ─────────────────────── STATISTICS ───────────────────────────
+def _load_json(path):
+    """Parse a JSON file, using orjson or msgspec when one is installed."""
+    with open(path, "rb") as f:
+        return _loads(f.read())
 
-def compute_gpu_stats(snapshots, gpu_idx):
-    metrics = {
-        "temp_c": [], "power_w": [], "util_gpu": [], "util_mem": [],
-        "mem_used_gb": [], "mem_pct": [], "fan_pct": [],
-        "clock_core_mhz": [], "clock_mem_mhz": [],
-    }
-    timestamps = []
 
-    for snap in snapshots:
-        for g in snap.get("gpus", []):
-            if g["idx"] != gpu_idx:
+def _loads(data):
+    """Parse JSON bytes with the fastest installed parser."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            # Same contract as json/orjson, whose decode errors are ValueErrors
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def _num(value, integral):
+    """Convert a NumPy scalar back to the type the report stored: int for
+    whole-number metrics, float (undoing float32 noise) otherwise."""
+    return int(value) if integral else round(float(value), 2)
+
+
+def _mean_num(total, count, integral):
+    """Mean rounded to 1 decimal, displayed like statistics.mean: an exact
+    mean of whole numbers stays an int."""
+    if integral and total % count == 0:
+        return int(total // count)
+    return round(total / count, 1)
+
+
+# ─────────────────────── STATISTICS ───────────────────────────
+
+# Column order of the per-GPU metric array built by compute_gpu_stats.
+METRIC_KEYS = (
+    "temp_c", "power_w", "util_gpu", "util_mem",
+    "mem_used_gb", "mem_pct", "fan_pct",
+    "clock_core_mhz", "clock_mem_mhz",
+)
+# Metrics NVML reports as whole numbers; their "values" are kept as int16
+INT_METRIC_KEYS = frozenset((
+    "temp_c", "util_gpu", "util_mem", "fan_pct", "clock_core_mhz", "clock_mem_mhz",
+))
+_INT16_MIN, _INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+# Metrics drawn as sparklines/heatmaps; only these keep their "values" series
+SERIES_KEYS = frozenset(("temp_c", "power_w", "util_gpu", "mem_pct"))
+
+
+def collect_gpu_metrics(snapshots, gpu_idx):
+    """Collect one GPU's metrics into a float32 (snapshots × metrics) array plus timestamps."""
+    return collect_all_gpu_metrics(snapshots, (gpu_idx,))[gpu_idx]
+
+
+def _column_stats_numpy(arr):
+    """Per-column (counts, mins, maxs, means, stdevs) via NaN-aware NumPy reductions."""
+    nan_mask = np.isnan(arr)
+    if not nan_mask.any():
+        # Every snapshot reported every metric: the plain reductions skip the
+        # NaN-replacing copies the nan* variants make.
+        counts = np.full(arr.shape[1], arr.shape[0], dtype=np.int64)
+        stdevs = arr.std(axis=0, ddof=1) if arr.shape[0] > 1 else np.zeros(arr.shape[1])
+        return counts, arr.min(axis=0), arr.max(axis=0), arr.mean(axis=0), stdevs
+
+    # All-NaN columns only warn; callers check counts before using them.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mins = np.nanmin(arr, axis=0)
+        maxs = np.nanmax(arr, axis=0)
+        means = np.nanmean(arr, axis=0)
+        stdevs = np.nanstd(arr, axis=0, ddof=1)
+    counts = np.count_nonzero(~nan_mask, axis=0)
+    return counts, mins, maxs, means, stdevs
+
+
+def _column_stats_fused(arr):
+    """Same as _column_stats_numpy in a single row-major sweep (Welford mean/variance)."""
+    n_rows, n_cols = arr.shape
+    counts = np.zeros(n_cols, dtype=np.int64)
+    mins = np.full(n_cols, np.inf)
+    maxs = np.full(n_cols, -np.inf)
+    means = np.zeros(n_cols)
+    m2 = np.zeros(n_cols)
+    for i in range(n_rows):
+        for j in range(n_cols):
+            x = arr[i, j]
+            if np.isnan(x):
                 continue
-            for key in metrics:
-                if key in g:
-                    metrics[key].append(g[key])
-            timestamps.append(snap.get("elapsed_s", 0))
-
-    stats = {}
-    for key, vals in metrics.items():
-        if not vals:
-            stats[key] = {"min": 0, "max": 0, "avg": 0, "stdev": 0, "values": []}
+            counts[j] += 1
+            if x < mins[j]:
+                mins[j] = x
+            if x > maxs[j]:
+                maxs[j] = x
+            delta = x - means[j]
+            means[j] += delta / counts[j]
+            m2[j] += delta * (x - means[j])
+    stdevs = np.zeros(n_cols)
+    for j in range(n_cols):
+        if counts[j] > 1:
+            stdevs[j] = np.sqrt(m2[j] / (counts[j] - 1))
+    return counts, mins, maxs, means, stdevs
+
+
+# The fused sweep only pays off compiled; plain Python falls back to NumPy.
+# No fastmath: it would let numba drop the NaN checks.
+_column_stats = njit(cache=True)(_column_stats_fused) if njit is not None else _column_stats_numpy
+
+
+def reduce_gpu_metrics(arr, timestamps):
+    """Reduce a metric array from collect_gpu_metrics into the per-metric stats dict."""
+    n = len(arr)
+    stats = {"_timestamps": timestamps}
+    empty = {"min": 0, "max": 0, "avg": 0, "stdev": 0, "count": 0}
+
+    def _empty(key):
+        return dict(empty, values=arr[:0, 0]) if key in SERIES_KEYS else dict(empty)
+
+    if n == 0:
+        for key in METRIC_KEYS:
+            stats[key] = _empty(key)
+        return stats
+
+    # Missing keys are NaN and excluded from counts
+    counts, mins, maxs, _, stdevs = _column_stats(arr)
+
+    for i, key in enumerate(METRIC_KEYS):
+        if counts[i] == 0:
+            stats[key] = _empty(key)
             continue
+        integral = key in INT_METRIC_KEYS
+        # float64 sum: exact for whole numbers, where a float32 mean can miss the integer
+        avg = _mean_num(float(np.nansum(arr[:, i], dtype=np.float64)), int(counts[i]), integral)
         stats[key] = {
-            "min": min(vals),
-            "max": max(vals),
-            "avg": round(statistics.mean(vals), 1),
-            "stdev": round(_safe_stdev(vals), 1),
-            "values": vals,
+            "min": _num(mins[i], integral),
+            "max": _num(maxs[i], integral),
+            "avg": avg,
+            "stdev": round(float(stdevs[i]), 1) if counts[i] > 1 else 0.0,
+            "count": int(counts[i]),
         }
-    stats["_timestamps"] = timestamps
+        if key not in SERIES_KEYS:
+            continue
+        values = arr[:, i]
+        if counts[i] < n:
+            values = values[~np.isnan(values)]
+        if key in INT_METRIC_KEYS and _INT16_MIN <= mins[i] and maxs[i] <= _INT16_MAX:
+            values = values.astype(np.int16)
+        stats[key]["values"] = values
     return stats
 
 
+def compute_gpu_stats(snapshots, gpu_idx):
+    """Per-metric min/max/avg/stdev and raw values for one GPU."""
+    return reduce_gpu_metrics(*collect_gpu_metrics(snapshots, gpu_idx))
+
+
+class _MetricBuffer:
+    """Growable (rows × metrics) float32 buffer plus timestamps, truncated on finish."""
+
+    def __init__(self, capacity=1024):
+        capacity = max(capacity, 1)
+        self.arr = np.empty((capacity, len(METRIC_KEYS)), dtype=np.float32)
+        self.timestamps = np.empty(capacity, dtype=np.float32)
+        self.n = 0
+
+    def append(self, row, elapsed_s):
+        if self.n == len(self.arr):
+            self.arr = np.concatenate([self.arr, np.empty_like(self.arr)])
+            self.timestamps = np.concatenate([self.timestamps, np.empty_like(self.timestamps)])
+        self.arr[self.n] = row
+        self.timestamps[self.n] = elapsed_s
+        self.n += 1
+
+    def finish(self):
+        return self.arr[:self.n], self.timestamps[:self.n]
+
+
+def bucket_snapshots(snapshots, gpu_idxs):
+    """Split snapshots by GPU in one pass: {idx: (metric rows, elapsed_s list)}."""
+    buckets = {idx: ([], []) for idx in gpu_idxs}
+    for snap in snapshots:
+        elapsed = snap.get("elapsed_s", 0)
+        for g in snap.get("gpus", []):
+            bucket = buckets.get(g["idx"])
+            if bucket is not None:
+                bucket[0].append([g.get(key, np.nan) for key in METRIC_KEYS])
+                bucket[1].append(elapsed)
+    return buckets
+
+
+def collect_all_gpu_metrics(snapshots, gpu_idxs):
+    """collect_gpu_metrics for several GPUs in a single pass over the snapshots."""
+    # One array conversion per GPU instead of a NumPy row assignment per snapshot
+    return {
+        idx: (
+            np.array(rows, dtype=np.float32).reshape(-1, len(METRIC_KEYS)),
+            np.array(timestamps, dtype=np.float32),
+        )
+        for idx, (rows, timestamps) in bucket_snapshots(snapshots, gpu_idxs).items()
+    }
+
+
+# ─────────────────────── STATS CACHE ──────────────────────────
+
+STATS_CACHE_SUFFIX = ".stats.npz"
+
+
+def _report_cache_key(filepath):
+    st = os.stat(filepath)
+    return np.array([st.st_mtime, st.st_size], dtype=np.float64)
+
+
+def load_stats_cache(filepath):
+    """Return (report header, {gpu_idx: (arr, timestamps)}) from the side-car
+    cache, or None if stale/missing. The header is the report without its
+    snapshots (plus "_n_snapshots"), so a hit never reads the report itself."""
+    try:
+        with np.load(filepath + STATS_CACHE_SUFFIX) as cache:
+            if not np.array_equal(cache["key"], _report_cache_key(filepath)):
+                return None
+            header = _loads(cache["header"].tobytes())
+            arrays = {
+                int(idx): (cache[f"gpu{idx}_metrics"], cache[f"gpu{idx}_timestamps"])
+                for idx in cache["gpu_idxs"]
+            }
+            return header, arrays
+    except Exception:
+        return None
+
+
+def save_stats_cache(filepath, header, arrays):
+    """Write the report header and per-GPU metric arrays next to the report,
+    keyed by its mtime and size."""
+    payload = {
+        "key": _report_cache_key(filepath),
+        "header": np.frombuffer(_dump_json(header).encode("utf-8"), dtype=np.uint8),
+        "gpu_idxs": np.array(sorted(arrays), dtype=np.int64),
+    }
+    for idx, (arr, timestamps) in arrays.items():
+        payload[f"gpu{idx}_metrics"] = arr
+        payload[f"gpu{idx}_timestamps"] = timestamps
+
+    cache_path = filepath + STATS_CACHE_SUFFIX
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **payload)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # read-only directory: just skip caching
+
+
+# ─────────────────────── LOADING ──────────────────────────────
+
+_SNAP_PREFIX = "snapshots.item"
+_GPU_PREFIX = "snapshots.item.gpus.item"
+_METRIC_COLS = {key: i for i, key in enumerate(METRIC_KEYS)}
+_NO_METRICS = (
+    np.empty((0, len(METRIC_KEYS)), dtype=np.float32),
+    np.empty(0, dtype=np.float32),
+)
+
+
+# Cold loads of reports above this size stream through ijson (when installed):
+# about 2x slower than orjson plus one bucketing pass, but the snapshot dicts
+# never all sit in memory at once
+STREAM_THRESHOLD_BYTES = 512 * 1024 * 1024
+
+
+def stream_report(filepath, capacity=1024):
+    """Parse a report with ijson without materializing the snapshot dicts.
+
+    Returns (report, arrays): the report with "snapshots" replaced by a
+    "_n_snapshots" count, and {gpu_idx: (arr, timestamps)} as built by
+    collect_gpu_metrics. capacity is the expected snapshot count, used to
+    size the per-GPU buffers.
+    """
+    header = ijson.ObjectBuilder()
+    buffers = {}
+    n_snap = 0
+    rows = []
+    row = row_idx = None
+    elapsed = 0.0
+
+    with open(filepath, "rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "snapshots" or prefix.startswith("snapshots."):
+                if prefix == _SNAP_PREFIX:
+                    if event == "start_map":
+                        n_snap += 1
+                        rows = []
+                        elapsed = 0.0
+                    elif event == "end_map":
+                        for idx, r in rows:
+                            buf = buffers.get(idx)
+                            if buf is None:
+                                buf = buffers[idx] = _MetricBuffer(capacity)
+                            buf.append(r, elapsed)
+                elif prefix == _GPU_PREFIX:
+                    if event == "start_map":
+                        row, row_idx = [np.nan] * len(METRIC_KEYS), None
+                    elif event == "end_map" and row_idx is not None:
+                        rows.append((row_idx, row))
+                elif prefix == _SNAP_PREFIX + ".elapsed_s":
+                    elapsed = value
+                elif prefix.startswith(_GPU_PREFIX) and value is not None:
+                    key = prefix[len(_GPU_PREFIX) + 1:]
+                    if key == "idx":
+                        row_idx = value
+                    elif key in _METRIC_COLS:
+                        row[_METRIC_COLS[key]] = value
+                continue
+            if prefix == "" and event == "map_key" and value == "snapshots":
+                continue
+            header.event(event, value)
+
+    report = header.value
+    report["_n_snapshots"] = n_snap
+    return report, {idx: buf.finish() for idx, buf in buffers.items()}
+
+
+def load_report(filepath, n_snapshots=None):
+    """Load a report header plus its per-GPU metric arrays.
+
+    A fresh stats cache answers both without reading the report. Otherwise
+    the report is parsed whole (orjson/msgspec when installed) and bucketed
+    per GPU in one pass, or streamed with ijson above STREAM_THRESHOLD_BYTES.
+    Either way "snapshots" is replaced by a "_n_snapshots" count.
+    n_snapshots is the snapshot count if already known (from the picker).
+    """
+    cached = load_stats_cache(filepath)
+    if cached is not None:
+        report, arrays = cached
+    else:
+        if ijson is not None and os.path.getsize(filepath) > STREAM_THRESHOLD_BYTES:
+            report, arrays = stream_report(filepath, capacity=n_snapshots or 1024)
+        else:
+            report = _load_json(filepath)
+            snapshots = report.pop("snapshots", [])
+            report["_n_snapshots"] = len(snapshots)
+            gpus = report.get("config", {}).get("gpus", [])
+            arrays = collect_all_gpu_metrics(snapshots, [idx for idx, _ in gpus])
+            del snapshots
+        save_stats_cache(filepath, report, arrays)
+
+    # Parse dates once here so renderers only do dict lookups
+    report["_started_fmt"] = _fmt_iso(report.get("test_started", "?"))
+    report["_ended_fmt"] = _fmt_iso(report.get("test_ended", "?"))
+    return report, arrays
+
+
+def _snapshot_count(report):
+    if "_n_snapshots" in report:
+        return report["_n_snapshots"]
+    return len(report.get("snapshots", []))
+
+
 # ─────────────────────── RENDER ───────────────────────────────
 
 def render_header(report):
+    _get_console().print(_header_panel(report))
+
+
+def _header_panel(report):
     config = report.get("config", {})
     mode = config.get("mode", "?")
     mode_label = MODE_LABELS.get(mode, mode)
@@ -176,16 +616,8 @@ def render_header(report):
     gpus_list = config.get("gpus", [])
     gpu_names = ", ".join(f"GPU {g[0]}: {g[1]}" for g in gpus_list)
 
-    started = report.get("test_started", "?")
-    ended = report.get("test_ended", "?")
-    try:
-        started = datetime.datetime.fromisoformat(started).strftime("%d/%m/%Y %H:%M:%S")
-    except Exception:
-        pass
-    try:
-        ended = datetime.datetime.fromisoformat(ended).strftime("%d/%m/%Y %H:%M:%S")
-    except Exception:
-        pass
+    started = report.get("_started_fmt") or _fmt_iso(report.get("test_started", "?"))
+    ended = report.get("_ended_fmt") or _fmt_iso(report.get("test_ended", "?"))
 
     if "Concluído" in result or "✅" in result:
         result_style = "bold green"
@@ -208,27 +640,61 @@ def render_header(report):
     lines.append("  📅 Término:     ", style="bold cyan")
     lines.append(f"{ended}\n", style="white")
     lines.append("  📊 Snapshots:   ", style="bold cyan")
-    lines.append(f"{len(report.get('snapshots', []))}\n", style="white")
+    lines.append(f"{_snapshot_count(report)}\n", style="white")
     lines.append("  🏁 Resultado:   ", style="bold cyan")
     lines.append(f"{result}", style=result_style)
 
-    console.print(Panel(
+    return Panel(
         lines,
         title="[bold white]══ RESUMO DO TESTE ══[/bold white]",
         border_style="bright_blue",
         box=box.DOUBLE_EDGE,
         padding=(1, 1),
-    ))
-
+    )
 
-def render_gpu_section(stats, gpu_idx, gpu_name, peak_data):
-    """Render a complete GPU analysis section — clean and large."""
 
-    console.print()
-    console.print(f"  [bold magenta]{'═' * 60}[/bold magenta]")
-    console.print(f"  [bold magenta]  GPU {gpu_idx}: {gpu_name}[/bold magenta]")
-    console.print(f"  [bold magenta]{'═' * 60}[/bold magenta]")
-    console.print()
+# (label, stats key, unit) for the per-GPU stats table and the sparkline block
+_STAT_ROWS = (
+    ("🌡  Temperatura", "temp_c", "°C"),
+    ("⚡ Potência", "power_w", " W"),
+    ("📊 GPU Load", "util_gpu", "%"),
+    ("📊 Mem Bus", "util_mem", "%"),
+    ("💾 VRAM", "mem_used_gb", " GB"),
+    ("💾 VRAM %", "mem_pct", "%"),
+    ("🌀 Fan", "fan_pct", "%"),
+    ("🕐 Core Clk", "clock_core_mhz", " MHz"),
+    ("🕐 Mem Clk", "clock_mem_mhz", " MHz"),
+)
+
+_SPARK_ITEMS = (
+    ("  🌡  Temp    ", "temp_c", "°C"),
+    ("  ⚡ Power   ", "power_w", " W"),
+    ("  📊 GPU %   ", "util_gpu", "%"),
+    ("  💾 VRAM %  ", "mem_pct", "%"),
+)
+
+
+def render_gpu_section(stats, gpu_idx, gpu_name, peak_data, console=None, width=None):
+    """Render a complete GPU analysis section — clean and large.
+
+    width is the terminal width resolved once by the caller; None asks the console.
+    """
+    if console is None:
+        console = _get_console()
+    if width is None:
+        width = console.size.width
+
+    # Everything is collected into one Group and printed once; markup strings
+    # go through render_str so they highlight exactly as console.print would.
+    markup = console.render_str
+    blank = Text("")
+    parts = [
+        blank,
+        markup(f"  [bold magenta]{'═' * 60}[/bold magenta]"),
+        markup(f"  [bold magenta]  GPU {gpu_idx}: {gpu_name}[/bold magenta]"),
+        markup(f"  [bold magenta]{'═' * 60}[/bold magenta]"),
+        blank,
+    ]
 
     # ── Simple 4-column stats table (no sparklines) ──
     t = Table(box=box.ROUNDED, expand=True, show_lines=True, padding=(0, 1))
@@ -237,39 +703,27 @@ def render_gpu_section(stats, gpu_idx, gpu_name, peak_data):
     t.add_column("Média", style="yellow", justify="right", min_width=12)
     t.add_column("Máx", style="red", justify="right", min_width=12)
 
-    rows = [
-        ("🌡  Temperatura", "temp_c", "°C"),
-        ("⚡ Potência", "power_w", " W"),
-        ("📊 GPU Load", "util_gpu", "%"),
-        ("📊 Mem Bus", "util_mem", "%"),
-        ("💾 VRAM", "mem_used_gb", " GB"),
-        ("💾 VRAM %", "mem_pct", "%"),
-        ("🌀 Fan", "fan_pct", "%"),
-        ("🕐 Core Clk", "clock_core_mhz", " MHz"),
-        ("🕐 Mem Clk", "clock_mem_mhz", " MHz"),
-    ]
-
-    for label, key, unit in rows:
+    for label, key, unit in _STAT_ROWS:
         s = stats.get(key, {})
-        if not s.get("values"):
+        if not s.get("count", 0):
             continue
         if key == "fan_pct" and s["max"] < 0:
             continue
 
-        # Color the max temperature
-        if key == "temp_c":
-            tc = _temp_color(s["max"])
-            max_val = f"[{tc}]{s['max']}{unit}[/{tc}]"
-        else:
-            max_val = f"{s['max']}{unit}"
-
-        t.add_row(label, f"{s['min']}{unit}", f"{s['avg']}{unit}", max_val)
+        # Plain Text cells skip Rich's markup parser; color the max temperature
+        max_style = _temp_color(s["max"]) if key == "temp_c" else ""
+        t.add_row(
+            Text(label),
+            Text(f"{s['min']}{unit}"),
+            Text(f"{s['avg']}{unit}"),
+            Text(f"{s['max']}{unit}", style=max_style),
+        )
 
-    console.print(t)
+    parts.append(t)
 
     # ── Peak summary (horizontal, compact) ──
     if peak_data:
-        console.print()
+        parts.append(blank)
         tc = _temp_color(peak_data.get("max_temp_c", 0))
         peak_text = Text()
         peak_text.append("  🏆 Picos:  ", style="bold white")
@@ -284,124 +738,203 @@ def render_gpu_section(stats, gpu_idx, gpu_name, peak_data):
         peak_text.append(f"  │  ", style="dim")
         peak_text.append(f"Load Médio ", style="dim")
         peak_text.append(f"{peak_data.get('avg_util_gpu', '?')}%", style="bold white")
-        console.print(peak_text)
+        parts.append(peak_text)
 
     # ── Full-width sparkline graphs (one per line, easy to read) ──
-    console.print()
-    console.print("  [bold white]📈 Gráficos Temporais[/bold white]")
-    console.print()
+    parts += [blank, markup("  [bold white]📈 Gráficos Temporais[/bold white]"), blank]
 
-    spark_width = max(console.size.width - 20, 30)
+    spark_width = max(width - 20, 30)
+    sparklines = _render_cache(stats, width).get("_sparklines", {})
 
-    spark_items = [
-        ("  🌡  Temp    ", "temp_c", "°C"),
-        ("  ⚡ Power   ", "power_w", " W"),
-        ("  📊 GPU %   ", "util_gpu", "%"),
-        ("  💾 VRAM %  ", "mem_pct", "%"),
-    ]
-
-    for label, key, unit in spark_items:
+    for label, key, unit in _SPARK_ITEMS:
         s = stats.get(key, {})
         vals = s.get("values", [])
-        if not vals:
+        if not len(vals):
             continue
 
         # Label with range
         header = Text()
         header.append(label, style="bold cyan")
         header.append(f"[{s['min']}{unit} → {s['max']}{unit}]", style="dim")
-        console.print(header)
 
         # Full-width sparkline
-        spark = _sparkline_rich(vals, width=spark_width)
-        console.print(f"  ", end="")
-        console.print(spark)
-        console.print()
+        spark = sparklines.get(key)
+        if spark is None:
+            spark = _sparkline_rich(vals, width=spark_width, bounds=(s["min"], s["max"]))
+        parts += [header, Text.assemble("  ", spark), blank]
 
     # ── Timeline heatmap (3 wide rows) ──
-    render_heatmap(stats)
+    parts += _heatmap_renderables(stats, console, width)
 
     # ── Health Verdict ──
-    render_verdict(stats)
+    parts.append(_verdict_panel(stats))
+
+    console.print(Group(*parts))
+
+_HEAT_BLOCK = "██"
+# Heatmap buckets for np.digitize: ascending limits, one more style than limits
+_TEMP_HEAT_LIMITS = np.array((60, 70, 80, 90), dtype=np.float32)
+_TEMP_HEAT_STYLES = ("cyan", "green", "yellow", "red", "bold red")
+_LOAD_HEAT_LIMITS = np.array((40, 70, 95), dtype=np.float32)
+_LOAD_HEAT_STYLES = ("red", "yellow", "green", "bold green")
+# Power is relative to the run's max power
+_POWER_HEAT_LIMITS = np.array((0.4, 0.7, 0.9), dtype=np.float64)
+_POWER_HEAT_STYLES = ("dim", "green", "yellow", "bold red")
+
+
+_HEAT_ROWS = {
+    "temp_c": (_TEMP_HEAT_LIMITS, _TEMP_HEAT_STYLES),
+    "power_w": (_POWER_HEAT_LIMITS, _POWER_HEAT_STYLES),
+    "util_gpu": (_LOAD_HEAT_LIMITS, _LOAD_HEAT_STYLES),
+}
+
+
+def _classify_numpy(values, limits):
+    """Bucket index per value: how many of the ascending limits are <= it."""
+    return np.digitize(values, limits).astype(np.int8)
+
+
+def _classify_loop(values, limits):
+    """Loop form of _classify_numpy, for numba to compile."""
+    out = np.empty(len(values), dtype=np.int8)
+    for i in range(len(values)):
+        b = 0
+        while b < len(limits) and values[i] >= limits[b]:
+            b += 1
+        out[i] = b
+    return out
+
+
+_classify = njit(cache=True)(_classify_loop) if njit is not None else _classify_numpy
+
+
+def _heatmap_bins(stats, key, bar_width):
+    """Classify every step-th sample of a metric into its heatmap bucket."""
+    s = stats.get(key, {})
+    values = s.get("values", ())
+    if not len(values):
+        return None
+    # One ██ cell per sample, so sample down to as many cells as fit in the bar
+    cells = max(bar_width // len(_HEAT_BLOCK), 1)
+    sampled = np.asarray(values, dtype=np.float64 if key == "power_w" else None)
+    if len(sampled) > cells:
+        sampled = sampled[_sample_indices(len(sampled), cells)]
+    if key == "power_w":
+        max_pwr = s["max"]
+        sampled = sampled / max_pwr if max_pwr > 0 else np.zeros(len(sampled))
+    return _classify(sampled, _HEAT_ROWS[key][0])
+
+
+def precompute_render_cache(stats, width):
+    """Build sparklines and heatmap buckets once per GPU.
+
+    Both reuse the min/max already in stats instead of rescanning the
+    series; render_gpu_section and render_heatmap pick them up from
+    stats["_sparklines"] and stats["_heat_bins"]. Rendering the same stats
+    again at the same width reuses them.
+    """
+    if stats.get("_render_width") == width:
+        return stats
+    bar_width = max(width - 20, 30)
+    sparklines = {}
+    for _, key, _ in _SPARK_ITEMS:
+        s = stats.get(key, {})
+        if len(s.get("values", ())):
+            sparklines[key] = _sparkline_rich(s["values"], width=bar_width, bounds=(s["min"], s["max"]))
+    stats["_sparklines"] = sparklines
+    stats["_heat_bins"] = {key: _heatmap_bins(stats, key, bar_width) for key in _HEAT_ROWS}
+    stats["_render_width"] = width
+    return stats
+
+
+def _render_cache(stats, width):
+    """The precomputed render pieces in stats, or {} if they were built for another width."""
+    return stats if stats.get("_render_width") == width else {}
+
+
+def _build_heatmap_line(bins, styles):
+    """Emit one ██ per classified sample, one Text span per run."""
+    # Use wider blocks ██ for better visibility
+    lengths, run_bins = _run_lengths(bins)
+    return _text_from_runs(
+        [_HEAT_BLOCK * length for length in lengths.tolist()],
+        [styles[b] for b in run_bins.tolist()],
+    )
 
 
-def render_heatmap(stats):
+def render_heatmap(stats, console=None, width=None):
     """Wide colorful heatmap blocks for temp, power, load."""
+    if console is None:
+        console = _get_console()
+    parts = _heatmap_renderables(stats, console, width)
+    if parts:
+        console.print(Group(*parts))
+
+
+def _heatmap_renderables(stats, console, width=None):
+    """The heatmap rows, legends and time axis as a list of renderables."""
     temps = stats.get("temp_c", {}).get("values", [])
-    if not temps:
-        return
+    if not len(temps):
+        return []
 
-    bar_width = max(console.size.width - 20, 30)
+    if width is None:
+        width = console.size.width
+    bar_width = max(width - 20, 30)
+    heat_bins = _render_cache(stats, width).get("_heat_bins", {})
+    markup = console.render_str
+    blank = Text("")
 
-    console.print("  [bold white]🗺️  Heatmap[/bold white]")
-    console.print()
+    def _bins(key):
+        bins = heat_bins.get(key)
+        return _heatmap_bins(stats, key, bar_width) if bins is None else bins
+
+    def _row(label, key, styles):
+        return Text.assemble(markup(label), _build_heatmap_line(_bins(key), styles))
 
-    def _build_heatmap_line(values, thresholds):
-        """thresholds: list of (limit, style) from highest to lowest."""
-        step = max(1, len(values) // bar_width)
-        line = Text()
-        # Use wider blocks ██ for better visibility
-        for i in range(0, len(values), step):
-            v = values[i]
-            style = thresholds[-1][1]  # default
-            for limit, s in thresholds:
-                if v >= limit:
-                    style = s
-                    break
-            line.append("██", style=style)
-        return line
+    parts = [markup("  [bold white]🗺️  Heatmap[/bold white]"), blank]
 
     # Temperature
-    console.print("  [bold cyan]🌡  Temp[/bold cyan]   ", end="")
-    line = _build_heatmap_line(temps, [
-        (90, "bold red"), (80, "red"), (70, "yellow"), (60, "green"), (0, "cyan")
-    ])
-    console.print(line)
-    console.print("             [cyan]<60[/] [green]60-70[/] [yellow]70-80[/] [red]80-90[/] [bold red]90+[/]")
-    console.print()
+    parts += [
+        _row("  [bold cyan]🌡  Temp[/bold cyan]   ", "temp_c", _TEMP_HEAT_STYLES),
+        markup("             [cyan]<60[/] [green]60-70[/] [yellow]70-80[/] [red]80-90[/] [bold red]90+[/]"),
+        blank,
+    ]
 
     # Power (relative)
     powers = stats.get("power_w", {}).get("values", [])
-    if powers:
-        max_pwr = max(powers)
-        console.print("  [bold cyan]⚡ Power[/bold cyan]  ", end="")
-        step = max(1, len(powers) // bar_width)
-        line = Text()
-        for i in range(0, len(powers), step):
-            ratio = powers[i] / max_pwr if max_pwr > 0 else 0
-            if ratio >= 0.9:
-                line.append("██", style="bold red")
-            elif ratio >= 0.7:
-                line.append("██", style="yellow")
-            elif ratio >= 0.4:
-                line.append("██", style="green")
-            else:
-                line.append("██", style="dim")
-        console.print(line)
-        console.print(f"             [dim]<40%[/] [green]40-70%[/] [yellow]70-90%[/] [bold red]90%+[/] (max {max_pwr:.0f}W)")
-        console.print()
+    if len(powers):
+        max_pwr = stats["power_w"]["max"]
+        parts += [
+            _row("  [bold cyan]⚡ Power[/bold cyan]  ", "power_w", _POWER_HEAT_STYLES),
+            markup(f"             [dim]<40%[/] [green]40-70%[/] [yellow]70-90%[/] [bold red]90%+[/] (max {max_pwr:.0f}W)"),
+            blank,
+        ]
 
     # GPU Load
     utils = stats.get("util_gpu", {}).get("values", [])
-    if utils:
-        console.print("  [bold cyan]📊 Load[/bold cyan]   ", end="")
-        line = _build_heatmap_line(utils, [
-            (95, "bold green"), (70, "green"), (40, "yellow"), (0, "red")
-        ])
-        console.print(line)
-        console.print("             [red]<40%[/] [yellow]40-70%[/] [green]70-95%[/] [bold green]95%+[/]")
-        console.print()
+    if len(utils):
+        parts += [
+            _row("  [bold cyan]📊 Load[/bold cyan]   ", "util_gpu", _LOAD_HEAT_STYLES),
+            markup("             [red]<40%[/] [yellow]40-70%[/] [green]70-95%[/] [bold green]95%+[/]"),
+            blank,
+        ]
 
     # Time axis
     timestamps = stats.get("_timestamps", [])
-    if timestamps:
+    if len(timestamps):
         dur = timestamps[-1]
         axis = f"             0s ─── {_fmt_duration(dur * 0.25)} ─── {_fmt_duration(dur * 0.5)} ─── {_fmt_duration(dur * 0.75)} ─── {_fmt_duration(dur)}"
-        console.print(f"[dim]{axis}[/dim]")
-        console.print()
+        parts += [markup(f"[dim]{axis}[/dim]"), blank]
+    return parts
+
+
+def render_verdict(stats, console=None):
+    if console is None:
+        console = _get_console()
+    console.print(_verdict_panel(stats))
 
 
-def render_verdict(stats):
+def _verdict_panel(stats):
     max_temp = stats.get("temp_c", {}).get("max", 0)
     avg_util = stats.get("util_gpu", {}).get("avg", 0)
 
@@ -429,18 +962,58 @@ def render_verdict(stats):
     content.append(f"\n{verdict}\n\n", style=f"bold {border}")
     content.append(f"{detail}\n", style="white")
 
-    console.print(Panel(
+    return Panel(
         Align.center(content),
         title="[bold]🩺 Diagnóstico[/bold]",
         border_style=border,
         box=box.DOUBLE_EDGE,
         padding=(0, 2),
-    ))
+    )
+
+
+# (label, stats key, aggregate, unit) rows of the multi-GPU comparison
+_COMPARE_ROWS = (
+    ("🌡 Temp Máx", "temp_c", "max", "°C"),
+    ("🌡 Temp Média", "temp_c", "avg", "°C"),
+    ("⚡ Power Máx", "power_w", "max", " W"),
+    ("⚡ Power Média", "power_w", "avg", " W"),
+    ("📊 Load Médio", "util_gpu", "avg", "%"),
+    ("💾 VRAM Máx", "mem_used_gb", "max", " GB"),
+    ("🕐 Core Clk Máx", "clock_core_mhz", "max", " MHz"),
+)
+
+# Above this many GPUs the comparison is printed as a plain tab-separated grid
+COMPARE_TABLE_MAX_GPUS = 8
 
 
 def render_comparison(all_stats, config):
     if len(all_stats) < 2:
         return
+    console = _get_console()
+
+    gpus = config.get("gpus", [])
+
+    # Resolve every cell value once, before any rendering, from one flat lookup table
+    flat = {
+        (idx, key, agg): value
+        for idx, stats in all_stats.items()
+        for key, metric in stats.items()
+        if not key.startswith("_")
+        for agg, value in metric.items()
+        if agg != "values"
+    }
+    grid = []
+    for label, key, agg, unit in _COMPARE_ROWS:
+        values = [flat.get((idx, key, agg), "?") for idx, _ in gpus]
+        grid.append((label, key, unit, values))
+
+    if len(gpus) > COMPARE_TABLE_MAX_GPUS:
+        lines = ["\t".join(["Métrica"] + [f"GPU {idx}" for idx, _ in gpus])]
+        for label, key, unit, values in grid:
+            lines.append("\t".join([label] + [f"{val}{unit}" for val in values]))
+        console.print()
+        console.out("\n".join(lines), highlight=False)
+        return
 
     t = Table(
         title="[bold]⚔️  Comparação entre GPUs[/bold]",
@@ -449,28 +1022,15 @@ def render_comparison(all_stats, config):
         show_lines=True,
     )
     t.add_column("Métrica", style="bold cyan", min_width=16)
-
-    gpus = config.get("gpus", [])
     for idx, name in gpus:
         t.add_column(f"GPU {idx}", style="white", justify="right", min_width=14)
 
-    compare_rows = [
-        ("🌡 Temp Máx", "temp_c", "max", "°C"),
-        ("🌡 Temp Média", "temp_c", "avg", "°C"),
-        ("⚡ Power Máx", "power_w", "max", " W"),
-        ("⚡ Power Média", "power_w", "avg", " W"),
-        ("📊 Load Médio", "util_gpu", "avg", "%"),
-        ("💾 VRAM Máx", "mem_used_gb", "max", " GB"),
-        ("🕐 Core Clk Máx", "clock_core_mhz", "max", " MHz"),
-    ]
-
-    for label, key, agg, unit in compare_rows:
-        row = [label]
-        for idx, name in gpus:
-            s = all_stats.get(idx, {}).get(key, {})
-            val = s.get(agg, "?")
-            row.append(f"{val}{unit}")
-        t.add_row(*row)
+    for label, key, unit, values in grid:
+        cells = [Text(label)]
+        for val in values:
+            style = _temp_color(val) if key == "temp_c" and val != "?" else ""
+            cells.append(Text(f"{val}{unit}", style=style))
+        t.add_row(*cells)
 
     console.print()
     console.print(t)
@@ -478,49 +1038,152 @@ def render_comparison(all_stats, config):
 
 # ─────────────────────── FILE PICKER ──────────────────────────
 
+_PEEK_MODE_RE = re.compile(rb'"mode"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_PEEK_RESULT_RE = re.compile(rb'"result"\s*:\s*"((?:[^"\\]|\\.)*)"')
+# Every snapshot carries exactly one "elapsed_s" key (GPU entries don't).
+_PEEK_SNAPSHOT_RE = re.compile(rb'"elapsed_s"\s*:')
+
+
+def _peek_report_stream(path):
+    """Exact (mode, result, n_snap) from parser events, without building the snapshots."""
+    if ijson is None:
+        report = _load_json(path)
+        return (
+            report.get("config", {}).get("mode", "?"),
+            report.get("result", "?"),
+            len(report.get("snapshots", [])),
+        )
+    mode = result = "?"
+    n_snap = 0
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "snapshots.item" and event == "start_map":
+                n_snap += 1
+            elif prefix == "config.mode" and event == "string":
+                mode = value
+            elif prefix == "result" and event == "string":
+                result = value
+    return mode, result, n_snap
+
+
+def _peek_report(path):
+    """Read mode, result and snapshot count without parsing the snapshots."""
+    try:
+        return _peek_report_mmap(path)
+    except (OSError, ValueError):
+        # Empty files and filesystems without mmap support
+        return _peek_report_stream(path)
+
+
+def _peek_report_mmap(path):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mode = _PEEK_MODE_RE.search(mm)
+        result = _PEEK_RESULT_RE.search(mm)
+        n_snap = sum(1 for _ in _PEEK_SNAPSHOT_RE.finditer(mm))
+        mode = json.loads(b'"' + mode.group(1) + b'"') if mode else "?"
+        result = json.loads(b'"' + result.group(1) + b'"') if result else "?"
+    return mode, result, n_snap
+
+
+# Picker summaries of already-seen reports, keyed by path and validated by (mtime, size)
+PICKER_INDEX_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "gpu_report_viewer",
+    "index.json",
+)
+
+
+def _load_picker_index():
+    try:
+        index = _load_json(PICKER_INDEX_PATH)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _save_picker_index(index):
+    """Write the picker index atomically; a read-only cache dir just means no caching."""
+    tmp = PICKER_INDEX_PATH + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(PICKER_INDEX_PATH), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(_dump_json(index))
+        os.replace(tmp, PICKER_INDEX_PATH)
+    except OSError:
+        pass
+
+
+def _peek_report_cached(entry, index):
+    """_peek_report through the picker index; returns (mode, result, n_snap, changed)."""
+    st = entry.stat()
+    key = [st.st_mtime_ns, st.st_size]
+    cached = index.get(entry.path)
+    if isinstance(cached, dict) and cached.get("key") == key:
+        return cached["mode"], cached["result"], cached["n_snap"], False
+    mode, result, n_snap = _peek_report(entry.path)
+    index[entry.path] = {"key": key, "mode": mode, "result": result, "n_snap": n_snap}
+    return mode, result, n_snap, True
+
+
+def _fmt_report_stamp(name):
+    """gpu_report_YYYYmmdd_HHMMSS.json -> dd/mm/YYYY HH:MM:SS, without strptime."""
+    stamp = name[11:26]
+    if len(stamp) != 15 or stamp[8] != "_" or not (stamp[:8] + stamp[9:]).isdigit():
+        return "?"
+    return f"{stamp[6:8]}/{stamp[4:6]}/{stamp[:4]} {stamp[9:11]}:{stamp[11:13]}:{stamp[13:15]}"
+
+
 def pick_report_file():
+    """Let the user choose a report; returns (path, snapshot count or None if not peeked)."""
+    console = _get_console()
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    pattern = os.path.join(script_dir, "gpu_report_*.json")
-    files = sorted(glob.glob(pattern), reverse=True)
+    # One scandir pass; names embed the timestamp so a reverse name sort is newest-first
+    with os.scandir(script_dir) as it:
+        entries = sorted(
+            (e for e in it if e.name.startswith("gpu_report_") and e.name.endswith(".json") and e.is_file()),
+            key=lambda e: e.name,
+            reverse=True,
+        )
+    files = [e.path for e in entries]
 
     if not files:
         console.print("[red]❌ Nenhum relatório encontrado no diretório.[/red]")
         sys.exit(1)
 
     if len(files) == 1:
-        return files[0]
+        return files[0], None
 
     console.print("\n[bold cyan]📂 Relatórios disponíveis:[/bold cyan]\n")
 
-    for i, f in enumerate(files, 1):
-        basename = os.path.basename(f)
-        size_kb = round(os.path.getsize(f) / 1024, 1)
-        try:
-            parts = basename.replace("gpu_report_", "").replace(".json", "")
-            dt = datetime.datetime.strptime(parts, "%Y%m%d_%H%M%S")
-            date_str = dt.strftime("%d/%m/%Y %H:%M:%S")
-        except Exception:
-            date_str = "?"
+    index = _load_picker_index()
+    index_changed = False
+    n_snaps = {}
+
+    for i, entry in enumerate(entries, 1):
+        basename = entry.name
+        date_str = _fmt_report_stamp(basename)
 
         try:
-            with open(f, "r") as fh:
-                data = json.load(fh)
-                mode = data.get("config", {}).get("mode", "?")
-                mode_label = MODE_LABELS.get(mode, mode)
-                result = data.get("result", "?")
-                n_snap = len(data.get("snapshots", []))
-                desc = f"{date_str}  │  {mode_label}  │  {n_snap} snaps  │  {result[:30]}"
+            mode, result, n_snap, changed = _peek_report_cached(entry, index)
+            index_changed |= changed
+            n_snaps[i - 1] = n_snap
+            mode_label = MODE_LABELS.get(mode, mode)
+            desc = f"{date_str}  │  {mode_label}  │  {n_snap} snaps  │  {result[:30]}"
         except Exception:
+            size_kb = round(entry.stat().st_size / 1024, 1)
             desc = f"{basename} ({size_kb} KB)"
 
         console.print(f"  [bold yellow]{i:>2}[/bold yellow]) {desc}")
 
+    if index_changed:
+        _save_picker_index(index)
+
     console.print()
     try:
         choice = input("  Escolha (número): ").strip()
         idx = int(choice) - 1
         if 0 <= idx < len(files):
-            return files[idx]
+            return files[idx], n_snaps.get(idx)
         else:
             console.print("[red]Número inválido.[/red]")
             sys.exit(1)
@@ -529,64 +1192,156 @@ def pick_report_file():
         sys.exit(0)
 
 
-# ─────────────────────── MAIN ─────────────────────────────────
+# ─────────────────────── REPORT ───────────────────────────────
 
-def main():
-    if len(sys.argv) > 1:
-        filepath = sys.argv[1]
-    else:
-        filepath = pick_report_file()
+def _render_gpu_to_str(arrays, gpu_idx, gpu_name, peak_data, width):
+    """Reduce and render one GPU section into a private buffer; returns (text, stats)."""
+    buf = io.StringIO()
+    gpu_console = Console(
+        file=buf,
+        width=width,
+        color_system=_get_console().color_system,
+        force_terminal=_get_console().is_terminal,
+    )
+    stats = precompute_render_cache(reduce_gpu_metrics(*arrays), width)
+    render_gpu_section(stats, gpu_idx, gpu_name, peak_data, console=gpu_console, width=width)
+    return buf.getvalue(), stats
 
-    if not os.path.exists(filepath):
-        console.print(f"[red]❌ Arquivo não encontrado: {filepath}[/red]")
-        sys.exit(1)
 
-    with open(filepath, "r", encoding="utf-8") as f:
-        report = json.load(f)
+def render_report(report, filepath, arrays, file_size=None):
+    """Render the full report (banner, header, per-GPU sections, comparison, footer) to a string."""
+    console = _get_console()
+    config = report.get("config", {})
+    gpus = config.get("gpus", [])
+    n_snap = _snapshot_count(report)
+    # Terminal size is a syscall per lookup; resolve it once for every section
+    width = console.width
+
+    # Per-GPU sections are independent of each other and of the header: submit
+    # them first so their reduction and rendering overlap the header capture.
+    with ThreadPoolExecutor(max_workers=max(1, min(len(gpus), os.cpu_count() or 1))) as ex:
+        futures = [
+            ex.submit(
+                _render_gpu_to_str,
+                arrays.get(gpu_idx, _NO_METRICS), gpu_idx, gpu_name,
+                report.get(f"gpu_{gpu_idx}_peak", None), width,
+            )
+            for gpu_idx, gpu_name in gpus
+        ] if n_snap else []
+
+        with console.capture() as capture:
+            # ── Banner + Header ── (one print)
+            console.print(Group(
+                Text(""),
+                Align.center(Text(
+                    "🔍 GPU STRESS TEST — RELATÓRIO DETALHADO",
+                    style="bold white on rgb(20,20,80)",
+                )),
+                Text(""),
+                _header_panel(report),
+            ))
+
+            if not n_snap:
+                console.print("\n[yellow]⚠️  Nenhum snapshot neste relatório.[/yellow]")
+        parts = [capture.get()]
+        if not n_snap:
+            return "".join(parts)
+
+        # ── Per-GPU Analysis ── (emitted in order)
+        all_stats = {}
+        for (gpu_idx, _), future in zip(gpus, futures):
+            text, all_stats[gpu_idx] = future.result()
+            parts.append(text)
+
+    with console.capture() as capture:
+        # ── Multi-GPU comparison ──
+        render_comparison(all_stats, config)
+
+        # ── Footer ──
+        console.print()
+        console.print(
+            f"  [dim]📄 {os.path.basename(filepath)}  │  "
+            f"{round((os.path.getsize(filepath) if file_size is None else file_size) / 1024, 1)} KB  │  "
+            f"{n_snap} amostras[/dim]"
+        )
+        console.print()
+    parts.append(capture.get())
+    return "".join(parts)
 
-    console.clear()
 
-    # ── Banner ──
-    console.print()
-    console.print(Align.center(Text(
-        "🔍 GPU STRESS TEST — RELATÓRIO DETALHADO",
-        style="bold white on rgb(20,20,80)",
-    )))
-    console.print()
+def summarize_report(report, arrays):
+    """Machine-readable summary: header fields plus per-GPU stats without the series."""
+    config = report.get("config", {})
+    gpu_stats = {}
+    for gpu_idx, gpu_name in config.get("gpus", []):
+        stats = reduce_gpu_metrics(*arrays.get(gpu_idx, _NO_METRICS))
+        gpu_stats[str(gpu_idx)] = {
+            "name": gpu_name,
+            **{
+                key: {k: v for k, v in stats[key].items() if k != "values"}
+                for key in METRIC_KEYS
+                if stats[key]["count"]
+            },
+        }
+    return {
+        "mode": config.get("mode"),
+        "result": report.get("result"),
+        "test_started": report.get("test_started"),
+        "test_ended": report.get("test_ended"),
+        "total_elapsed_s": report.get("total_elapsed_s"),
+        "snapshots": _snapshot_count(report),
+        "gpu_stats": gpu_stats,
+    }
 
-    # ── Header ──
-    render_header(report)
 
-    # ── Per-GPU Analysis ──
-    config = report.get("config", {})
-    gpus = config.get("gpus", [])
-    snapshots = report.get("snapshots", [])
+def _dump_json(obj):
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    if msgspec is not None:
+        return msgspec.json.encode(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
-    if not snapshots:
-        console.print("\n[yellow]⚠️  Nenhum snapshot neste relatório.[/yellow]")
-        return
 
-    all_stats = {}
-    for gpu_idx, gpu_name in gpus:
-        stats = compute_gpu_stats(snapshots, gpu_idx)
-        all_stats[gpu_idx] = stats
+# ─────────────────────── MAIN ─────────────────────────────────
 
-        peak_key = f"gpu_{gpu_idx}_peak"
-        peak_data = report.get(peak_key, None)
+def main():
+    console = _get_console()
+    args = [a for a in sys.argv[1:] if a != "--tui"]
+    # Piped output (tee, grep, CI logs) gets a JSON summary unless --tui forces the dashboard
+    as_json = not sys.stdout.isatty() and "--tui" not in sys.argv[1:]
+
+    # In JSON mode stdout carries only the JSON line: errors go to stderr and
+    # the interactive picker is not offered
+    err_console = Console(stderr=True) if as_json else console
+
+    n_snapshots = None
+    if args:
+        filepath = args[0]
+    elif as_json:
+        err_console.print("[red]❌ Saída JSON requer o caminho do relatório (ou use --tui).[/red]")
+        sys.exit(2)
+    else:
+        # The picker already counted the snapshots; size the load buffers with it
+        filepath, n_snapshots = pick_report_file()
 
-        render_gpu_section(stats, gpu_idx, gpu_name, peak_data)
+    # One stat both checks the path and gives the footer its size
+    try:
+        file_size = os.stat(filepath).st_size
+    except OSError:
+        err_console.print(f"[red]❌ Arquivo não encontrado: {filepath}[/red]")
+        sys.exit(1)
 
-    # ── Multi-GPU comparison ──
-    render_comparison(all_stats, config)
+    report, arrays = load_report(filepath, n_snapshots)
 
-    # ── Footer ──
-    console.print()
-    console.print(
-        f"  [dim]📄 {os.path.basename(filepath)}  │  "
-        f"{round(os.path.getsize(filepath) / 1024, 1)} KB  │  "
-        f"{len(snapshots)} amostras[/dim]"
-    )
-    console.print()
+    if as_json:
+        sys.stdout.write(_dump_json(summarize_report(report, arrays)) + "\n")
+        return
+
+    console.clear()
+
+    # Render into buffers and hit the terminal once
+    sys.stdout.write(render_report(report, filepath, arrays, file_size))
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
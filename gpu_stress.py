@@ -18,19 +18,22 @@ import os
 import sys
 import time
 import json
+import ctypes
+import struct
+import bisect
 import signal
 import warnings
 import datetime
+import threading
 import traceback
 import subprocess
 import multiprocessing as mp
+from multiprocessing import shared_memory
 
 # Suppress pynvml deprecation warning
 warnings.filterwarnings("ignore", message=".*pynvml.*deprecated.*")
 
 import pynvml
-import questionary
-from questionary import Style as QStyle
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
@@ -45,81 +48,428 @@ TEMP_LIMIT_C = 95       # Hard thermal limit in °C
 SAMPLE_INTERVAL = 1.0   # Sensor polling interval in seconds
 REPORT_INTERVAL = 5     # Seconds between history snapshots
 UI_REFRESH_HZ = 2       # Dashboard refreshes per second
+LOOP_TICK_S = 0.05      # Main loop wake-up for duration/abort checks
 
 # ─────────────────────────── SENSOR READER ────────────────────────
-def read_gpu_metrics(gpu_index):
-    """Read all relevant metrics for a single GPU via NVML."""
+
+# Power draw and enforced limit (both mW), read with one nvmlDeviceGetFieldValues
+# call. Older pynvml builds lack these IDs; those fall back to the per-field calls.
+# POWER_AVERAGE is the ~1 s average nvmlDeviceGetPowerUsage returns, so both
+# paths report the same quantity.
+_POWER_FIELD_IDS = (
+    getattr(pynvml, "NVML_FI_DEV_POWER_AVERAGE", None),
+    getattr(pynvml, "NVML_FI_DEV_POWER_CURRENT_LIMIT", None),
+)
+# c_nvmlValue_t member for each NVML_VALUE_TYPE_* (double, uint, ulong, ulonglong, slonglong, sint)
+_FIELD_VALUE_MEMBERS = ("dVal", "uiVal", "ulVal", "ullVal", "sllVal", "siVal")
+
+# Clock throttle reasons that invalidate a stress run, with their dashboard labels.
+# Newer NVML calls them "clock event reasons"; the bit values are the same.
+_THROTTLE_REASONS = (
+    (getattr(pynvml, "nvmlClocksThrottleReasonSwPowerCap", 0x04), "Power cap"),
+    (getattr(pynvml, "nvmlClocksThrottleReasonHwSlowdown", 0x08), "HW slowdown"),
+    (getattr(pynvml, "nvmlClocksThrottleReasonSwThermalSlowdown", 0x20), "Térmico (SW)"),
+    (getattr(pynvml, "nvmlClocksThrottleReasonHwThermalSlowdown", 0x40), "Térmico (HW)"),
+    (getattr(pynvml, "nvmlClocksThrottleReasonHwPowerBrakeSlowdown", 0x80), "Power brake"),
+)
+_THROTTLE_MASK = sum(bit for bit, _ in _THROTTLE_REASONS)  # distinct single bits
+_get_throttle_reasons = (
+    getattr(pynvml, "nvmlDeviceGetCurrentClocksEventReasons", None)
+    or getattr(pynvml, "nvmlDeviceGetCurrentClocksThrottleReasons", None)
+)
+
+_GB = 1.0 / (1024 ** 3)
+
+_handles = {}             # gpu index -> NVML handle (stable for the whole run)
+_no_field_values = set()  # gpu indexes whose driver rejected the power field batch
+
+
+def _gpu_handle(gpu_index):
+    handle = _handles.get(gpu_index)
+    if handle is None:
+        handle = _handles[gpu_index] = pynvml.nvmlDeviceGetHandleByIndex(gpu_index)
+    return handle
+
+
+def _read_power_fields(gpu_index, handle):
+    """(power_w, power_limit_w) from a single field-values query, or None if unsupported."""
+    if None in _POWER_FIELD_IDS or gpu_index in _no_field_values:
+        return None
     try:
-        handle = pynvml.nvmlDeviceGetHandleByIndex(gpu_index)
-        name = pynvml.nvmlDeviceGetName(handle)
-        if isinstance(name, bytes):
-            name = name.decode("utf-8")
+        values = pynvml.nvmlDeviceGetFieldValues(handle, list(_POWER_FIELD_IDS))
+        if any(v.nvmlReturn != pynvml.NVML_SUCCESS for v in values):
+            raise pynvml.NVMLError(pynvml.NVML_ERROR_NOT_SUPPORTED)
+    except pynvml.NVMLError:
+        _no_field_values.add(gpu_index)
+        return None
+    power_mw, limit_mw = (getattr(v.value, _FIELD_VALUE_MEMBERS[v.valueType]) for v in values)
+    return power_mw / 1000.0, limit_mw / 1000.0
 
-        util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-        mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
-        temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
 
-        try:
-            power_w = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
-        except pynvml.NVMLError:
-            power_w = 0.0
+def _nvml_supported(fn, *args):
+    try:
+        fn(*args)
+        return True
+    except pynvml.NVMLError:
+        return False
 
-        try:
-            power_limit_w = pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
-        except pynvml.NVMLError:
-            power_limit_w = 0.0
 
-        try:
-            fan = pynvml.nvmlDeviceGetFanSpeed(handle)
-        except pynvml.NVMLError:
-            fan = -1  # water-cooled or unsupported
+_static_cache = {}  # gpu index -> per-run constant device data, see _static_info
 
-        try:
-            clk_core = pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_GRAPHICS)
-        except pynvml.NVMLError:
-            clk_core = 0
 
+def _static_info(gpu_index):
+    """Handle, name, power limit, total memory and sensor support for a GPU, queried once."""
+    info = _static_cache.get(gpu_index)
+    if info is not None:
+        return info
+
+    handle = _gpu_handle(gpu_index)
+    name = pynvml.nvmlDeviceGetName(handle)
+    if isinstance(name, bytes):
+        name = name.decode("utf-8")
+    try:
+        power_limit_w = pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
+    except pynvml.NVMLError:
+        power_limit_w = 0.0
+    mem_total = pynvml.nvmlDeviceGetMemoryInfo(handle).total
+    try:
+        max_clock_core = pynvml.nvmlDeviceGetMaxClockInfo(handle, pynvml.NVML_CLOCK_GRAPHICS)
+    except pynvml.NVMLError:
+        max_clock_core = 0
+
+    info = _static_cache[gpu_index] = {
+        "handle": handle,
+        "name": name,
+        "power_limit_w": power_limit_w,
+        "mem_total_bytes": mem_total,
+        "mem_total_gb": round(mem_total * _GB, 2),
+        # Optional sensors are probed here once instead of raising every tick
+        "has_power": _nvml_supported(pynvml.nvmlDeviceGetPowerUsage, handle),
+        "has_fan": _nvml_supported(pynvml.nvmlDeviceGetFanSpeed, handle),
+        "has_clock_core": _nvml_supported(pynvml.nvmlDeviceGetClockInfo, handle, pynvml.NVML_CLOCK_GRAPHICS),
+        "has_clock_mem": _nvml_supported(pynvml.nvmlDeviceGetClockInfo, handle, pynvml.NVML_CLOCK_MEM),
+        "has_throttle": _get_throttle_reasons is not None and _nvml_supported(_get_throttle_reasons, handle),
+        "max_clock_core_mhz": max_clock_core,
+    }
+    return info
+
+
+class _HotNvml:
+    """
+    Direct ctypes calls into the NVML library pynvml already loaded, for the
+    fields read on every sample (utilization, memory, temperature). Output
+    buffers are allocated once and reused, instead of pynvml building fresh
+    ctypes structs and Python wrappers per call. Arguments are passed as
+    ctypes objects, so the shared function pointers' argtypes are untouched.
+    """
+
+    def __init__(self, lib):
+        self._util_fn = lib.nvmlDeviceGetUtilizationRates
+        self._mem_fn = lib.nvmlDeviceGetMemoryInfo
+        self._temp_fn = lib.nvmlDeviceGetTemperature
+        self._util = pynvml.c_nvmlUtilization_t()
+        self._mem = pynvml.c_nvmlMemory_t()
+        self._temp = ctypes.c_uint()
+        self._sensor = ctypes.c_uint(pynvml.NVML_TEMPERATURE_GPU)
+
+    def read(self, handle):
+        """(util_gpu, util_mem, mem_used_bytes, temp_c); raises NVMLError like pynvml."""
+        for ret in (
+            self._util_fn(handle, ctypes.byref(self._util)),
+            self._mem_fn(handle, ctypes.byref(self._mem)),
+            self._temp_fn(handle, self._sensor, ctypes.byref(self._temp)),
+        ):
+            if ret != pynvml.NVML_SUCCESS:
+                raise pynvml.NVMLError(ret)
+        return self._util.gpu, self._util.memory, self._mem.used, self._temp.value
+
+
+_hot_nvml = None  # _HotNvml for this process, or False when pynvml's library isn't reachable
+
+
+def _hot_reader():
+    global _hot_nvml
+    if _hot_nvml is None:
+        lib = getattr(pynvml, "nvmlLib", None)
+        if lib is None:
+            return False  # before nvmlInit; try again next time
         try:
-            clk_mem = pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_MEM)
-        except pynvml.NVMLError:
-            clk_mem = 0
+            _hot_nvml = _HotNvml(lib)
+        except (AttributeError, TypeError):
+            _hot_nvml = False  # older/unusual pynvml builds: stay on the wrapper
+    return _hot_nvml
+
+
+def read_gpu_metrics(gpu_index):
+    """
+    Read all relevant metrics for a single GPU via NVML. Values are kept at
+    full precision; rounding to report precision happens in _snapshot_gpu.
+    """
+    try:
+        static = _static_info(gpu_index)
+        handle = static["handle"]
+        mem_total = static["mem_total_bytes"]
+
+        hot = _hot_reader()
+        if hot:
+            util_gpu, util_mem, mem_used, temp = hot.read(handle)
+        else:
+            util = pynvml.nvmlDeviceGetUtilizationRates(handle)
+            util_gpu, util_mem = util.gpu, util.memory
+            mem_used = pynvml.nvmlDeviceGetMemoryInfo(handle).used
+            temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+
+        power = _read_power_fields(gpu_index, handle)
+        if power is not None:
+            power_w, power_limit_w = power
+        else:
+            power_w = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0 if static["has_power"] else 0.0
+            power_limit_w = static["power_limit_w"]
+
+        # -1 = water-cooled or unsupported
+        fan = pynvml.nvmlDeviceGetFanSpeed(handle) if static["has_fan"] else -1
+        clk_core = pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_GRAPHICS) if static["has_clock_core"] else 0
+        clk_mem = pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_MEM) if static["has_clock_mem"] else 0
+        throttle = _get_throttle_reasons(handle) & _THROTTLE_MASK if static["has_throttle"] else 0
 
         return {
             "idx": gpu_index,
-            "name": name,
-            "util_gpu": util.gpu,
-            "util_mem": util.memory,
-            "mem_used_gb": round(mem.used / (1024 ** 3), 2),
-            "mem_total_gb": round(mem.total / (1024 ** 3), 2),
-            "mem_pct": round(mem.used / mem.total * 100, 1),
+            "name": static["name"],
+            "util_gpu": util_gpu,
+            "util_mem": util_mem,
+            "mem_used_gb": mem_used * _GB,
+            "mem_total_gb": static["mem_total_gb"],
+            "mem_pct": mem_used * 100 / mem_total,
             "temp_c": temp,
-            "power_w": round(power_w, 1),
-            "power_limit_w": round(power_limit_w, 0),
+            "power_w": power_w,
+            "power_limit_w": power_limit_w,
             "fan_pct": fan,
             "clock_core_mhz": clk_core,
             "clock_mem_mhz": clk_mem,
+            "clock_core_max_mhz": static["max_clock_core_mhz"],
+            "throttle_reasons": throttle,
         }
     except pynvml.NVMLError:
         return None
 
 
+def _snapshot_gpu(m):
+    """Copy of a read_gpu_metrics reading rounded to the report's precision."""
+    snap = dict(m)
+    snap["mem_used_gb"] = round(m["mem_used_gb"], 2)
+    snap["mem_pct"] = round(m["mem_pct"], 1)
+    snap["power_w"] = round(m["power_w"], 1)
+    snap["power_limit_w"] = round(m["power_limit_w"], 0)
+    return snap
+
+
+# One shared-memory slot per GPU: a valid flag, the GPU index and the numeric
+# fields of a read_gpu_metrics reading. Name and total memory never change, so the
+# reader takes them from its own static cache instead.
+_SLOT_FIELDS = (
+    "idx", "util_gpu", "util_mem", "temp_c", "fan_pct",
+    "power_w", "power_limit_w", "mem_used_gb", "mem_pct",
+    "clock_core_mhz", "clock_mem_mhz", "clock_core_max_mhz", "throttle_reasons",
+)
+_METRIC_SLOT = struct.Struct("<I IIIIi dddd IIII")
+
+
+def _pack_metrics(buf, slot, m):
+    offset = slot * _METRIC_SLOT.size
+    if m is None:
+        _METRIC_SLOT.pack_into(buf, offset, 0, *([0] * len(_SLOT_FIELDS)))
+    else:
+        _METRIC_SLOT.pack_into(buf, offset, 1, *[m[k] for k in _SLOT_FIELDS])
+
+
+def _unpack_metrics(buf, slot):
+    valid, *values = _METRIC_SLOT.unpack_from(buf, slot * _METRIC_SLOT.size)
+    if not valid:
+        return None
+    m = dict(zip(_SLOT_FIELDS, values))
+    static = _static_info(m["idx"])
+    m["name"] = static["name"]
+    m["mem_total_gb"] = static["mem_total_gb"]
+    return m
+
+
+def _sampler_loop(gpu_indexes, shm_name, lock, interval, halt, fresh, tripped):
+    """Body of the sampler process: poll NVML and publish into the shared slots."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    pynvml.nvmlInit()
+    try:
+        trip_slot = len(gpu_indexes)
+        while True:
+            metrics = [read_gpu_metrics(i) for i in gpu_indexes]
+            hot = None
+            if not tripped.is_set():
+                hot = next((m for m in metrics if m and m["temp_c"] >= TEMP_LIMIT_C), None)
+            with lock:
+                for slot, m in enumerate(metrics):
+                    _pack_metrics(shm.buf, slot, m)
+                if hot is not None:
+                    _pack_metrics(shm.buf, trip_slot, hot)
+            if hot is not None:
+                tripped.set()
+            fresh.set()
+            if halt.wait(interval):
+                break
+    finally:
+        pynvml.nvmlShutdown()
+        shm.close()
+
+
+class Sampler:
+    """
+    Polls NVML for the selected GPUs every `interval` seconds in a separate
+    process, so neither driver calls nor their Python overhead compete with
+    the dashboard for the GIL. Readings are published in place into a
+    shared-memory block (one fixed slot per GPU); `latest()` unpacks them.
+
+    Also watches the thermal limit: the first reading at or above
+    TEMP_LIMIT_C is kept in an extra slot and exposed as `over_limit`;
+    main then aborts the workers.
+    """
+
+    def __init__(self, gpu_indexes, interval=SAMPLE_INTERVAL):
+        self.gpu_indexes = list(gpu_indexes)
+        self.interval = interval
+        self.fresh = mp.Event()  # set after every published reading
+        self._tripped = mp.Event()
+        self._halt = mp.Event()
+        self._lock = mp.Lock()
+        self._over_limit = None
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=_METRIC_SLOT.size * (len(self.gpu_indexes) + 1)
+        )
+        self._proc = mp.Process(
+            target=_sampler_loop,
+            args=(self.gpu_indexes, self._shm.name, self._lock, interval,
+                  self._halt, self.fresh, self._tripped),
+            name="nvml-sampler",
+            daemon=True,
+        )
+
+    def start(self):
+        """Start polling; waits for the first reading so the dashboard never starts empty."""
+        self._proc.start()
+        self.fresh.wait(self.interval + 5)
+
+    def latest(self):
+        buf = self._shm.buf
+        with self._lock:
+            return [_unpack_metrics(buf, slot) for slot in range(len(self.gpu_indexes))]
+
+    @property
+    def over_limit(self):
+        if self._over_limit is None and self._tripped.is_set():
+            with self._lock:
+                self._over_limit = _unpack_metrics(self._shm.buf, len(self.gpu_indexes))
+        return self._over_limit
+
+    def stop(self):
+        self._halt.set()
+        self._proc.join(timeout=self.interval + 1)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._shm.close()
+        self._shm.unlink()
+
+
 # ─────────────────────────── STRESS WORKERS ───────────────────────
 
 # Number of kernel launches between each abort-event check.
 # Higher = less CPU overhead = more GPU saturation.
 _BATCH_ITERS = 50
 
+# Seconds between abort-flag polls while waiting on a queued batch
+_BATCH_POLL_S = 0.002
+
+# Caching-allocator settings for the workers. Expandable segments let the
+# VRAM fill grow segments in place instead of fragmenting into OOM early.
+_CUDA_ALLOC_CONF = "expandable_segments:True,max_split_size_mb:512"
+
+
+# Untimed iterations a worker runs before signalling it is warmed up
+_WARMUP_ITERS = 5
+
+
+def _signal_ready(ready):
+    """
+    Wait at the warm-up barrier shared with main and the other workers, so
+    every GPU enters its hot loop together. A broken barrier (main gave up
+    waiting, or another worker died) just means: start now.
+    """
+    try:
+        ready.wait()
+    except threading.BrokenBarrierError:
+        pass
+
+
+def _wait_previous_batch(dev, streams, pending, abort_event):
+    """
+    Mark the end of the batch just queued on `streams` and wait for the batch
+    before it, instead of torch.cuda.synchronize. The GPU always has one batch
+    queued ahead (no drain bubble) and the abort flag is polled while it runs.
+    """
+    import torch
+    current = torch.cuda.current_stream(dev)
+    for s in streams:
+        current.wait_stream(s)
+    marker = torch.cuda.Event()
+    marker.record(current)
+    pending.append(marker)
+    if len(pending) < 2:
+        return
+    previous = pending.pop(0)
+    while not previous.query():
+        if abort_event.is_set():
+            return
+        time.sleep(_BATCH_POLL_S)
+
+
+def _capture_batch(dev, streams, batch):
+    """
+    Record one call of `batch` (which queues _BATCH_ITERS iterations on
+    `streams`) as a CUDA graph, so each batch is a single replay instead of
+    hundreds of Python-side kernel launches. Returns None when capture is not
+    supported; callers then keep launching `batch` eagerly.
+    """
+    import torch
+    try:
+        # Warm-up outside capture: cuBLAS handles and workspaces get created here
+        batch()
+        torch.cuda.synchronize(dev)
+
+        graph = torch.cuda.CUDAGraph()
+        capture = torch.cuda.Stream(device=dev)
+        with torch.cuda.graph(graph, stream=capture):
+            # Fork the worker streams off the capture stream and join them back
+            for s in streams:
+                s.wait_stream(capture)
+            batch()
+            for s in streams:
+                capture.wait_stream(s)
+        return graph
+    except Exception:
+        torch.cuda.synchronize(dev)
+        return None
+
 
-def _worker_compute(gpu_index, abort_event):
+def _worker_compute(gpu_index, abort_event, ready):
     """
     Saturate GPU CUDA/Tensor cores with continuous matrix multiplications.
-    Uses multiple CUDA streams + FP32 & FP16 workloads for maximum load.
+    Uses multiple CUDA streams + FP32 (TF32), FP16 & BF16 workloads for maximum load.
     """
     import torch
     try:
         dev = torch.device(f"cuda:{gpu_index}")
         torch.cuda.set_device(dev)
 
+        # Route FP32 matmuls through the Tensor Cores (TF32) on Ampere and newer
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+
         # Large matrices to keep all SMs busy
         size = 8192
 
@@ -131,62 +481,120 @@ def _worker_compute(gpu_index, abort_event):
         a16 = torch.randn(size, size, device=dev, dtype=torch.float16)
         b16 = torch.randn(size, size, device=dev, dtype=torch.float16)
 
-        # Multiple CUDA streams to keep the GPU pipeline full
-        streams = [torch.cuda.Stream(device=dev) for _ in range(4)]
+        # One (a, b) operand pair per CUDA stream to keep the GPU pipeline full
+        pairs = [(a32, b32), (a16, b16), (a32, b32), (a16, b16)]
 
-        while not abort_event.is_set():
+        # BF16 workload on its own stream (native on Ampere and newer)
+        if torch.cuda.is_bf16_supported():
+            abf16 = torch.randn(size, size, device=dev, dtype=torch.bfloat16)
+            bbf16 = torch.randn(size, size, device=dev, dtype=torch.bfloat16)
+            pairs.append((abf16, bbf16))
+
+        streams = [torch.cuda.Stream(device=dev) for _ in pairs]
+
+        # Persistent outputs (one per stream) so launches never hit the allocator
+        lanes = [(s, a, b, torch.empty_like(a)) for s, (a, b) in zip(streams, pairs)]
+        set_stream = torch.cuda.set_stream
+
+        def batch():
+            # set_stream is one C call per switch; the `with` form saves and
+            # restores the stream on every launch. Restore once at the end.
+            base = torch.cuda.current_stream(dev)
             for _ in range(_BATCH_ITERS):
                 # Dispatch work across streams so kernels overlap
-                with torch.cuda.stream(streams[0]):
-                    torch.matmul(a32, b32)
-                with torch.cuda.stream(streams[1]):
-                    torch.matmul(a16, b16)
-                with torch.cuda.stream(streams[2]):
-                    torch.matmul(a32, b32)
-                with torch.cuda.stream(streams[3]):
-                    torch.matmul(a16, b16)
-            # Sync only once per batch to check the abort flag
-            torch.cuda.synchronize(dev)
+                for s, a, b, c in lanes:
+                    set_stream(s)
+                    torch.mm(a, b, out=c)
+            set_stream(base)
+
+        # Capture runs one full warm-up batch first (cuBLAS heuristics, workspaces)
+        graph = _capture_batch(dev, streams, batch)
+        run_batch = graph.replay if graph is not None else batch
+        _signal_ready(ready)
+
+        pending = []
+        while not abort_event.is_set():
+            run_batch()
+            # Keep one batch queued ahead; poll the abort flag while it runs
+            _wait_previous_batch(dev, streams, pending, abort_event)
+        torch.cuda.synchronize(dev)
     except Exception:
         traceback.print_exc()
 
 
-def _worker_vram(gpu_index, abort_event):
+# Smallest chunk the VRAM fill will fall back to (~256 MB of float32)
+_MIN_CHUNK_ELEMS = 64 * 1024 * 1024
+
+
+def _fill_vram(dev, target_bytes, abort_event):
+    """
+    Allocate float32 chunks on `dev` until `target_bytes` are held or VRAM
+    runs out. Starts with a quarter of the target per chunk and halves the
+    size on each OOM, so the fill ends up as a handful of large tensors
+    instead of hundreds of small ones.
+    """
+    import torch
+    chunks = []
+    chunk_elems = max(target_bytes // 4 // 4, _MIN_CHUNK_ELEMS)
+    allocated = 0
+    retried = False
+    while allocated < target_bytes and not abort_event.is_set():
+        elems = min(chunk_elems, max((target_bytes - allocated) // 4, 1))
+        try:
+            chunks.append(torch.randn(elems, device=dev))
+            allocated += elems * 4
+        except torch.cuda.OutOfMemoryError:
+            if chunk_elems > _MIN_CHUNK_ELEMS:
+                chunk_elems //= 2
+            elif retried:
+                break
+            else:
+                # Release cached blocks and retry once at the smallest size
+                retried = True
+                torch.cuda.empty_cache()
+    return chunks
+
+
+def _worker_vram(gpu_index, abort_event, ready):
     """Fill VRAM to the maximum and then perform continuous R/W on it."""
     import torch
     try:
         dev = torch.device(f"cuda:{gpu_index}")
         torch.cuda.set_device(dev)
 
-        chunks = []
-        chunk_elems = 64 * 1024 * 1024  # ~256 MB per chunk (float32)
-
         # Phase 1: allocate until OOM
-        while not abort_event.is_set():
-            try:
-                chunks.append(torch.randn(chunk_elems, device=dev))
-            except torch.cuda.OutOfMemoryError:
-                break
+        free_bytes, _ = torch.cuda.mem_get_info(dev)
+        chunks = _fill_vram(dev, free_bytes, abort_event)
 
         if not chunks:
             return
 
         # Phase 2: heavy R/W to keep memory bus and compute busy
         streams = [torch.cuda.Stream(device=dev) for _ in range(2)]
-        n = len(chunks)
+        # Alternate chunks between the two streams, one group per stream
+        groups = [chunks[0::2], chunks[1::2]]
+        lanes = [(s, group) for s, group in zip(streams, groups) if group]
+        set_stream = torch.cuda.set_stream
+        base = torch.cuda.current_stream(dev)
+        # The fill itself is the warm-up: the allocator has already grown to size
+        _signal_ready(ready)
+        pending = []
         while not abort_event.is_set():
             for _ in range(_BATCH_ITERS):
-                for i in range(n):
-                    s = streams[i % 2]
-                    with torch.cuda.stream(s):
-                        # Continuous arithmetic to stress memory bandwidth + ALUs
-                        chunks[i].mul_(1.00001).add_(0.00001)
-            torch.cuda.synchronize(dev)
+                for s, group in lanes:
+                    set_stream(s)
+                    # Continuous arithmetic to stress memory bandwidth + ALUs;
+                    # x += 1e-5 * x is one fused read/write pass, and the
+                    # foreach form covers every chunk of the group per launch
+                    torch._foreach_add_(group, group, alpha=0.00001)
+            set_stream(base)
+            _wait_previous_batch(dev, streams, pending, abort_event)
+        torch.cuda.synchronize(dev)
     except Exception:
         traceback.print_exc()
 
 
-def _worker_mix(gpu_index, abort_event):
+def _worker_mix(gpu_index, abort_event, ready):
     """Combined heavy compute + VRAM fill — maximum possible GPU stress."""
     import torch
     try:
@@ -199,15 +607,7 @@ def _worker_mix(gpu_index, abort_event):
             pynvml.nvmlDeviceGetHandleByIndex(gpu_index)
         )
         target_bytes = int(mem.free * 0.70)
-        chunk_elems = 64 * 1024 * 1024
-        allocated = 0
-        vram_chunks = []
-        while allocated < target_bytes and not abort_event.is_set():
-            try:
-                vram_chunks.append(torch.randn(chunk_elems, device=dev))
-                allocated += chunk_elems * 4
-            except torch.cuda.OutOfMemoryError:
-                break
+        vram_chunks = _fill_vram(dev, target_bytes, abort_event)
 
         # ── Compute workload with remaining memory ──
         size = 4096  # Smaller to fit alongside VRAM allocation
@@ -215,30 +615,45 @@ def _worker_mix(gpu_index, abort_event):
         b32 = torch.randn(size, size, device=dev)
         a16 = torch.randn(size, size, device=dev, dtype=torch.float16)
         b16 = torch.randn(size, size, device=dev, dtype=torch.float16)
+        c32 = torch.empty_like(a32)
+        c16 = torch.empty_like(a16)
 
         streams = [torch.cuda.Stream(device=dev) for _ in range(4)]
-        n_chunks = len(vram_chunks)
 
-        while not abort_event.is_set():
+        # VRAM R/W lanes on the other two streams. Each sweeps a fixed 256 MB
+        # view, whatever size _fill_vram picked for the chunks, so memory
+        # traffic stays in the same balance with the matmuls on every card.
+        vram_lanes = [(s, chunk[:_MIN_CHUNK_ELEMS]) for s, chunk in zip(streams[2:], vram_chunks[:2])]
+        set_stream = torch.cuda.set_stream
+
+        def batch():
+            base = torch.cuda.current_stream(dev)
             for _ in range(_BATCH_ITERS):
                 # Compute on two streams
-                with torch.cuda.stream(streams[0]):
-                    torch.matmul(a32, b32)
-                with torch.cuda.stream(streams[1]):
-                    torch.matmul(a16, b16)
-                # VRAM R/W on the other two streams
-                if n_chunks > 0:
-                    with torch.cuda.stream(streams[2]):
-                        vram_chunks[0].mul_(1.00001).add_(0.00001)
-                    if n_chunks > 1:
-                        with torch.cuda.stream(streams[3]):
-                            vram_chunks[1].mul_(1.00001).add_(0.00001)
-            torch.cuda.synchronize(dev)
+                set_stream(streams[0])
+                torch.mm(a32, b32, out=c32)
+                set_stream(streams[1])
+                torch.mm(a16, b16, out=c16)
+                for s, chunk in vram_lanes:
+                    set_stream(s)
+                    chunk.add_(chunk, alpha=0.00001)
+            set_stream(base)
+
+        # Capture runs one full warm-up batch first (cuBLAS heuristics, workspaces)
+        graph = _capture_batch(dev, streams, batch)
+        run_batch = graph.replay if graph is not None else batch
+        _signal_ready(ready)
+
+        pending = []
+        while not abort_event.is_set():
+            run_batch()
+            _wait_previous_batch(dev, streams, pending, abort_event)
+        torch.cuda.synchronize(dev)
     except Exception:
         traceback.print_exc()
 
 
-def _worker_pcie(gpu_index, abort_event):
+def _worker_pcie(gpu_index, abort_event, ready):
     """Heavy Host-to-Device and Device-to-Host transfers to stress PCIe/NVLink."""
     import torch
     try:
@@ -248,22 +663,43 @@ def _worker_pcie(gpu_index, abort_event):
         # ~256MB chunks for large DMA transfers
         size = 64 * 1024 * 1024
         
-        # Pinned memory ensures max PCIe bandwidth
-        host_tensor = torch.randn(size, pin_memory=True)
-        device_tensor = torch.empty(size, device=dev)
-        
+        # Pinned memory ensures max PCIe bandwidth. Separate buffers per
+        # direction: H2D and D2H share no tensor, so the two copy engines
+        # run concurrently and the link is loaded in both directions.
+        host_up = torch.randn(size, pin_memory=True)
+        host_down = torch.empty(size, pin_memory=True)
+        dev_up = torch.empty(size, device=dev)
+        dev_down = torch.randn(size, device=dev)
+
+        s_h2d = torch.cuda.Stream(device=dev)
+        s_d2h = torch.cuda.Stream(device=dev)
+        streams = (s_h2d, s_d2h)
+        set_stream = torch.cuda.set_stream
+        base = torch.cuda.current_stream(dev)
+
+        # Warm-up: first transfers map the pinned pages and wake the copy engines
+        dev_up.copy_(host_up, non_blocking=True)
+        host_down.copy_(dev_down, non_blocking=True)
+        torch.cuda.synchronize(dev)
+        _signal_ready(ready)
+
+        pending = []
         while not abort_event.is_set():
             for _ in range(_BATCH_ITERS):
                 # Copy H2D
-                device_tensor.copy_(host_tensor, non_blocking=True)
+                set_stream(s_h2d)
+                dev_up.copy_(host_up, non_blocking=True)
                 # Copy D2H
-                host_tensor.copy_(device_tensor, non_blocking=True)
-            torch.cuda.synchronize(dev)
+                set_stream(s_d2h)
+                host_down.copy_(dev_down, non_blocking=True)
+            set_stream(base)
+            _wait_previous_batch(dev, streams, pending, abort_event)
+        torch.cuda.synchronize(dev)
     except Exception:
         traceback.print_exc()
 
 
-def _worker_transient(gpu_index, abort_event):
+def _worker_transient(gpu_index, abort_event, ready):
     """Spikes GPU load 0% to 100% rapidly to test PSU stability."""
     import time
     import torch
@@ -274,11 +710,17 @@ def _worker_transient(gpu_index, abort_event):
         size = 8192
         a32 = torch.randn(size, size, device=dev)
         b32 = torch.randn(size, size, device=dev)
+        c32 = torch.empty_like(a32)
+
+        for _ in range(_WARMUP_ITERS):
+            torch.mm(a32, b32, out=c32)
+        torch.cuda.synchronize(dev)
+        _signal_ready(ready)
         
         while not abort_event.is_set():
             # 100% Load spike
             for _ in range(20):
-                torch.matmul(a32, b32)
+                torch.mm(a32, b32, out=c32)
             torch.cuda.synchronize(dev)
             
             # 0% Load sleep (creates a transient power spike when waking up)
@@ -287,7 +729,7 @@ def _worker_transient(gpu_index, abort_event):
         traceback.print_exc()
 
 
-def _worker_nvenc(gpu_index, abort_event):
+def _worker_nvenc(gpu_index, abort_event, ready):
     """Uses ffmpeg to stress NVENC/NVDEC chips on the GPU."""
     import time
     import subprocess
@@ -301,6 +743,8 @@ def _worker_nvenc(gpu_index, abort_event):
         ]
         
         proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Nothing to warm up on our side; ffmpeg ramps the encoder by itself
+        _signal_ready(ready)
         
         while not abort_event.is_set():
             # Restart if process fails or ends
@@ -314,7 +758,7 @@ def _worker_nvenc(gpu_index, abort_event):
         traceback.print_exc()
 
 
-def _worker_training(gpu_index, abort_event):
+def _worker_training(gpu_index, abort_event, ready):
     """Simulates real-world AI training (Linear layers, Loss, Backprop)."""
     import torch
     import torch.nn as nn
@@ -322,6 +766,8 @@ def _worker_training(gpu_index, abort_event):
     try:
         dev = torch.device(f"cuda:{gpu_index}")
         torch.cuda.set_device(dev)
+        # Let cuDNN pick and cache its fastest algorithms during warm-up
+        torch.backends.cudnn.benchmark = True
         
         # Build an overly wide MLP to saturate CUDA cores + memory
         model = nn.Sequential(
@@ -338,21 +784,31 @@ def _worker_training(gpu_index, abort_event):
         batch_size = 512
         inputs = torch.randn(batch_size, 8192, device=dev)
         targets = torch.randn(batch_size, 1000, device=dev)
+
+        def step():
+            # Drop grads instead of memset-ing them; backward re-creates them
+            optimizer.zero_grad(set_to_none=True)
+            outputs = model(inputs)
+            loss = criterion(outputs, targets)
+            loss.backward()
+            optimizer.step()
+
+        # Warm-up also allocates the Adam state, so the timed loop starts at full size
+        for _ in range(_WARMUP_ITERS):
+            step()
+        torch.cuda.synchronize(dev)
+        _signal_ready(ready)
         
         while not abort_event.is_set():
             # Train loop
             for _ in range(10): # Smaller inner loop for heavy graph ops
-                optimizer.zero_grad()
-                outputs = model(inputs)
-                loss = criterion(outputs, targets)
-                loss.backward()
-                optimizer.step()
+                step()
             torch.cuda.synchronize(dev)
     except Exception:
         traceback.print_exc()
 
 
-def _worker_precision(gpu_index, abort_event):
+def _worker_precision(gpu_index, abort_event, ready):
     """Stresses non-standard calculations (FP64 and FP16 combined logic)."""
     import torch
     try:
@@ -368,15 +824,26 @@ def _worker_precision(gpu_index, abort_event):
         # We also stress torch matrix int-like ops (FP16/BrainFloat natively supported)
         a16 = torch.randn(size, size, device=dev, dtype=torch.float16)
         b16 = torch.randn(size, size, device=dev, dtype=torch.float16)
+        c64 = torch.empty_like(a64)
+        c16 = torch.empty_like(a16)
 
-        while not abort_event.is_set():
+        def batch():
             for _ in range(_BATCH_ITERS):
                 # Heavy FP64 bottleneck
-                torch.matmul(a64, b64)
+                torch.mm(a64, b64, out=c64)
                 # Super fast FP16
-                torch.matmul(a16, b16)
+                torch.mm(a16, b16, out=c16)
                 # Intertwining them breaks branch prediction / pipeline
-            torch.cuda.synchronize(dev)
+
+        graph = _capture_batch(dev, (), batch)
+        run_batch = graph.replay if graph is not None else batch
+        _signal_ready(ready)
+
+        pending = []
+        while not abort_event.is_set():
+            run_batch()
+            _wait_previous_batch(dev, (), pending, abort_event)
+        torch.cuda.synchronize(dev)
     except Exception:
         traceback.print_exc()
 
@@ -392,130 +859,279 @@ STRESS_FUNCTIONS = {
     "precision": _worker_precision,
 }
 
+# Longest main waits for the workers' warm-up before starting the clock anyway
+_WARMUP_TIMEOUT_S = 60
+
+
+def _run_worker(mode, gpu_index, abort_event, ready):
+    """Worker process entry point; breaks `ready` if the worker exits before warming up."""
+    try:
+        STRESS_FUNCTIONS[mode](gpu_index, abort_event, ready)
+    finally:
+        ready.abort()
+
+
+def _launch_workers(mode, gpu_indexes, abort_event):
+    """
+    Start one `mode` worker per GPU. Returns the processes and the warm-up
+    barrier they share with main; poll it with _warmup_done before timing.
+    """
+    ready = mp.Barrier(len(gpu_indexes) + 1)
+    workers = []
+    for idx in gpu_indexes:
+        p = mp.Process(
+            target=_run_worker,
+            args=(mode, idx, abort_event, ready),
+            daemon=True,
+        )
+        p.start()
+        workers.append(p)
+    return workers, ready
+
+
+def _warmup_done(ready, deadline):
+    """
+    Non-blocking warm-up check, polled from the monitoring loop so the
+    thermal check keeps running. True once every worker waits at `ready`
+    (main's own wait then releases them all), the barrier broke (a worker
+    died), or `deadline` passed (the barrier is broken so stragglers start).
+    """
+    if ready.broken:
+        return True
+    if ready.n_waiting >= ready.parties - 1:
+        try:
+            ready.wait()
+        except threading.BrokenBarrierError:
+            pass
+        return True
+    if time.time() >= deadline:
+        ready.abort()
+        return True
+    return False
+
 
 # ─────────────────────────── TUI RENDERING ────────────────────────
+_TEMP_BUCKETS = (70, 80, 90)
+_TEMP_STYLES = ("green", "dark_orange", "yellow", "bold red")
+
+
 def _temp_color(temp_c):
-    if temp_c >= 90:
-        return "bold red"
-    if temp_c >= 80:
-        return "yellow"
-    if temp_c >= 70:
-        return "dark_orange"
-    return "green"
+    return _TEMP_STYLES[bisect.bisect_right(_TEMP_BUCKETS, temp_c)]
+
+
+def _throttle_labels(reasons):
+    return ", ".join(label for bit, label in _THROTTLE_REASONS if reasons & bit)
+
+
+_BAR_EIGHTHS = "▏▎▍▌▋▊▉"  # partial cell for 1/8 .. 7/8 of a block
+
+
+def _bar_steps(width):
+    """Every bar of `width` cells at 1/8-cell resolution, indexed by filled eighths."""
+    steps = []
+    for level in range(width * 8 + 1):
+        full, part = divmod(level, 8)
+        head = "█" * full + (_BAR_EIGHTHS[part - 1] if part else "")
+        steps.append(head + "░" * (width - len(head)))
+    return steps
+
+
+_BAR_CACHE = {20: _bar_steps(20)}
 
 
 def _bar(value, maximum=100, width=20):
-    """Return a plain-text bar like ████████░░░░░░░░ 65%."""
-    filled = int(round(value / maximum * width)) if maximum else 0
-    filled = max(0, min(width, filled))
-    empty = width - filled
-    pct = f"{value:.0f}%"
-    return f"{'█' * filled}{'░' * empty} {pct}"
+    """Return a plain-text bar like ████████▌░░░░░░░ 65%."""
+    steps = _BAR_CACHE.get(width)
+    if steps is None:
+        steps = _BAR_CACHE[width] = _bar_steps(width)
+    level = int(round(value / maximum * width * 8)) if maximum else 0
+    return f"{steps[max(0, min(width * 8, level))]} {value:.0f}%"
+
+
+class _GpuPanel:
+    """One GPU's panel; its value cells are Text objects rewritten in place each tick."""
+
+    ROWS = ("temp", "fan", "power", "clk_core", "clk_mem", "gap", "load", "vram")
+
+    def __init__(self, m, throttled):
+        self.throttled = throttled
+        self.cells = {key: Text() for key in self.ROWS}
+
+        t = Table(show_header=False, box=None, expand=True, padding=(0, 1))
+        t.add_column("label", style="bold cyan", min_width=14)
+        t.add_column("value", style="white", ratio=1)
+        labels = ("🌡  Temp:", "🌀 Fan:", "⚡ Power:", "🕐 Core Clk:", "🕐 Mem Clk:", "", "📊 GPU Load:", "💾 VRAM:")
+        for label, key in zip(labels, self.ROWS):
+            t.add_row(label, self.cells[key])
+        if throttled:
+            # Clocks are being cut: load numbers no longer reflect full speed
+            self.cells["throttle"] = Text(style="bold red")
+            t.add_row(Text("⚠ THROTTLE:", style="bold red"), self.cells["throttle"])
+
+        self.panel = Panel(
+            t,
+            title=f"[bold]GPU {m['idx']}: {m['name']}[/bold]",
+            box=box.ROUNDED,
+        )
 
+    def update(self, m):
+        cells = self.cells
+        cells["temp"].plain = f"{m['temp_c']} °C"
+        cells["temp"].style = _temp_color(m["temp_c"])
+        cells["fan"].plain = f"{m['fan_pct']}%" if m["fan_pct"] >= 0 else "N/A (water?)"
+        cells["power"].plain = f"{m['power_w']:.1f} W / {m['power_limit_w']:.0f} W"
+        max_clk = m.get("clock_core_max_mhz")
+        cells["clk_core"].plain = (
+            f"{m['clock_core_mhz']} / {max_clk} MHz" if max_clk else f"{m['clock_core_mhz']} MHz"
+        )
+        cells["clk_mem"].plain = f"{m['clock_mem_mhz']} MHz"
+        cells["load"].plain = _bar(m["util_gpu"])
+        cells["vram"].plain = f"{_bar(m['mem_pct'])}  ({m['mem_used_gb']:.1f}/{m['mem_total_gb']:.1f} GB)"
+        if self.throttled:
+            cells["throttle"].plain = _throttle_labels(m["throttle_reasons"])
 
-def build_dashboard(gpus_metrics, elapsed_s, duration_s, status, mode_label):
-    """Build the full Rich Layout for the dashboard."""
-    console = Console()
-    width = console.size.width
-    height = console.size.height
-
-    layout = Layout()
-    layout.split_column(
-        Layout(name="header", size=3),
-        Layout(name="body"),
-        Layout(name="footer", size=3),
-    )
-
-    # ── Header ──
-    elapsed_str = str(datetime.timedelta(seconds=int(elapsed_s)))
-    if duration_s > 0:
-        dur_str = str(datetime.timedelta(seconds=int(duration_s)))
-        remaining = max(0, duration_s - elapsed_s)
-        rem_str = str(datetime.timedelta(seconds=int(remaining)))
-        time_info = f"⏱  {elapsed_str} / {dur_str}  (restante: {rem_str})"
-    else:
-        time_info = f"⏱  {elapsed_str}  (sem limite)"
-
-    status_style = "bold green" if "Running" in status else "bold red"
-    if "Concluído" in status:
-        status_style = "bold cyan"
-
-    hdr = Table.grid(expand=True)
-    hdr.add_column(ratio=1)
-    hdr.add_column(ratio=2)
-    hdr.add_column(ratio=1)
-    hdr.add_row(
-        f" 🔥 [bold]GPU Stress[/]",
-        Align.center(Text(time_info)),
-        Align.right(Text(f"[{mode_label.upper()}] ", style="bold magenta") + Text(status, style=status_style)),
-    )
-    layout["header"].update(Panel(hdr, style="white on rgb(20,20,60)", box=box.HEAVY))
-
-    # ── GPU panels ──
-    n = len(gpus_metrics)
-    if n == 0:
-        layout["body"].update(Panel("Nenhuma GPU monitorada."))
-    else:
-        # Decide layout: side-by-side if width allows, else stacked
-        if n <= 2 and width >= 80:
-            layout["body"].split_row(
-                *[Layout(name=f"g{i}") for i in range(n)]
-            )
-        elif n <= 4 and width >= 120:
-            layout["body"].split_row(
-                *[Layout(name=f"g{i}") for i in range(n)]
-            )
+        temp = m["temp_c"]
+        self.panel.border_style = "red" if temp >= 90 or self.throttled else ("yellow" if temp >= 80 else "cyan")
+
+
+class DashboardState:
+    """
+    The dashboard Layout, built once and updated in place every tick.
+
+    Only the Text cells and border styles change between refreshes; the
+    Layout tree, panels and tables are rebuilt only when the GPU count or the
+    side-by-side/stacked arrangement changes (or a GPU starts/stops
+    throttling, which adds a row). The object itself is the renderable handed
+    to Live: rendering and `update` share a lock, so Live's refresh thread
+    never paints a half-updated frame.
+    """
+
+    def __init__(self, console):
+        self.console = console
+        self._lock = threading.Lock()
+        self._body_key = None
+        self._gpus = []
+
+        self._time = Text()
+        self._badge = Text()
+        hdr = Table.grid(expand=True)
+        hdr.add_column(ratio=1)
+        hdr.add_column(ratio=2)
+        hdr.add_column(ratio=1)
+        hdr.add_row(f" 🔥 [bold]GPU Stress[/]", Align.center(self._time), Align.right(self._badge))
+        self._header = Panel(hdr, style="white on rgb(20,20,60)", box=box.HEAVY)
+
+        self._footer = Panel(
+            Text(
+                f"  CTRL+C = Abortar  │  Limite térmico: {TEMP_LIMIT_C}°C  │  Resultados salvos em JSON ao finalizar",
+                style="dim",
+            ),
+            box=box.SIMPLE,
+        )
+        self.layout = None
+
+    def __rich_console__(self, console, options):
+        with self._lock:
+            yield self.layout
+
+    def _build_layout(self, n, stacked):
+        layout = Layout()
+        layout.split_column(
+            Layout(self._header, name="header", size=3),
+            Layout(name="body"),
+            Layout(self._footer, name="footer", size=3),
+        )
+        if n == 0:
+            layout["body"].update(Panel("Nenhuma GPU monitorada."))
         else:
-            layout["body"].split_column(
-                *[Layout(name=f"g{i}") for i in range(n)]
-            )
-
-        for i, m in enumerate(gpus_metrics):
-            if m is None:
-                layout[f"g{i}"].update(Panel("[red]Erro ao ler GPU[/red]"))
-                continue
-
-            t = Table(show_header=False, box=None, expand=True, padding=(0, 1))
-            t.add_column("label", style="bold cyan", min_width=14)
-            t.add_column("value", style="white", ratio=1)
-
-            tc = _temp_color(m["temp_c"])
-            t.add_row("🌡  Temp:", f"[{tc}]{m['temp_c']} °C[/{tc}]")
-
-            fan_str = f"{m['fan_pct']}%" if m["fan_pct"] >= 0 else "N/A (water?)"
-            t.add_row("🌀 Fan:", fan_str)
-
-            t.add_row("⚡ Power:", f"{m['power_w']} W / {m['power_limit_w']:.0f} W")
-            t.add_row("🕐 Core Clk:", f"{m['clock_core_mhz']} MHz")
-            t.add_row("🕐 Mem Clk:", f"{m['clock_mem_mhz']} MHz")
-            t.add_row("", "")
-            t.add_row("📊 GPU Load:", _bar(m["util_gpu"]))
-            t.add_row(
-                f"💾 VRAM:",
-                f"{_bar(m['mem_pct'])}  ({m['mem_used_gb']:.1f}/{m['mem_total_gb']:.1f} GB)",
-            )
-
-            border = "red" if m["temp_c"] >= 90 else ("yellow" if m["temp_c"] >= 80 else "cyan")
-            panel = Panel(
-                t,
-                title=f"[bold]GPU {m['idx']}: {m['name']}[/bold]",
-                border_style=border,
-                box=box.ROUNDED,
-            )
-            layout[f"g{i}"].update(panel)
-
-    # ── Footer ──
-    footer_txt = Text(
-        f"  CTRL+C = Abortar  │  Limite térmico: {TEMP_LIMIT_C}°C  │  Resultados salvos em JSON ao finalizar",
-        style="dim",
-    )
-    layout["footer"].update(Panel(footer_txt, box=box.SIMPLE))
-
-    return layout
+            # Decide layout: side-by-side if width allows, else stacked
+            split = layout["body"].split_column if stacked else layout["body"].split_row
+            split(*[Layout(name=f"g{i}") for i in range(n)])
+        self.layout = layout
+        self._gpus = [None] * n
+
+    def update(self, gpus_metrics, elapsed_s, duration_s, status, mode_label):
+        """Refresh the dashboard for a new reading; returns self for Live.update."""
+        width = self.console.size.width
+        n = len(gpus_metrics)
+        stacked = not ((n <= 2 and width >= 80) or (n <= 4 and width >= 120))
+
+        with self._lock:
+            if self._body_key != (n, stacked):
+                self._body_key = (n, stacked)
+                self._build_layout(n, stacked)
+            self._update_header(elapsed_s, duration_s, status, mode_label)
+
+            for i, m in enumerate(gpus_metrics):
+                gpu = self._gpus[i]
+                if m is None:
+                    if gpu is not False:
+                        self.layout[f"g{i}"].update(Panel("[red]Erro ao ler GPU[/red]"))
+                        self._gpus[i] = False
+                    continue
+                throttled = bool(m.get("throttle_reasons", 0))
+                if not gpu or gpu.throttled != throttled:
+                    gpu = self._gpus[i] = _GpuPanel(m, throttled)
+                    self.layout[f"g{i}"].update(gpu.panel)
+                gpu.update(m)
+        return self
+
+    def _update_header(self, elapsed_s, duration_s, status, mode_label):
+        elapsed_str = str(datetime.timedelta(seconds=int(elapsed_s)))
+        if duration_s > 0:
+            dur_str = str(datetime.timedelta(seconds=int(duration_s)))
+            remaining = max(0, duration_s - elapsed_s)
+            rem_str = str(datetime.timedelta(seconds=int(remaining)))
+            self._time.plain = f"⏱  {elapsed_str} / {dur_str}  (restante: {rem_str})"
+        else:
+            self._time.plain = f"⏱  {elapsed_str}  (sem limite)"
+
+        status_style = "bold green" if "Running" in status else "bold red"
+        if "Concluído" in status:
+            status_style = "bold cyan"
+        elif "Aquecendo" in status:
+            status_style = "bold yellow"
+
+        self._badge.plain = ""
+        self._badge.append(f"[{mode_label.upper()}] ", style="bold magenta")
+        self._badge.append(status, style=status_style)
+
+
+# ─────────────────────────── REPORT ───────────────────────────────
+
+# Snapshots between flushes of the spool file
+_SPOOL_FLUSH_EVERY = 10
+
+
+def _write_report(out_path, report, snap_path):
+    """
+    Write `report` as indented JSON, copying its "snapshots" array line by line
+    from the JSON-lines spool at `snap_path` instead of holding it in memory.
+    """
+    items = list(report.items())
+    with open(out_path, "w", encoding="utf-8") as out, open(snap_path, "r", encoding="utf-8") as spool:
+        out.write("{\n")
+        for n, (key, value) in enumerate(items):
+            out.write(f"  {json.dumps(key)}: ")
+            if key == "snapshots":
+                out.write("[")
+                sep = "\n    "
+                for line in spool:
+                    out.write(sep + line.rstrip("\n"))
+                    sep = ",\n    "
+                out.write("\n  ]" if sep != "\n    " else "]")
+            else:
+                out.write(json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            out.write(",\n" if n < len(items) - 1 else "\n")
+        out.write("}\n")
 
 
 # ─────────────────────────── MAIN ─────────────────────────────────
 def main():
+    # Imported here: spawned workers re-import this module and never need the menu
+    import questionary
+    from questionary import Style as QStyle
+
     pynvml.nvmlInit()
     device_count = pynvml.nvmlDeviceGetCount()
 
@@ -527,12 +1143,10 @@ def main():
     # ── Interactive menu ──
     gpu_choices = []
     for i in range(device_count):
-        h = pynvml.nvmlDeviceGetHandleByIndex(i)
-        name = pynvml.nvmlDeviceGetName(h)
-        if isinstance(name, bytes):
-            name = name.decode("utf-8")
-        mem = pynvml.nvmlDeviceGetMemoryInfo(h)
-        mem_gb = round(mem.total / (1024 ** 3), 1)
+        # Fills the static cache read_gpu_metrics relies on during the run
+        static = _static_info(i)
+        name = static["name"]
+        mem_gb = round(static["mem_total_bytes"] / (1024 ** 3), 1)
         gpu_choices.append(
             questionary.Choice(f"GPU {i}: {name} ({mem_gb} GB)", value=(i, name))
         )
@@ -608,24 +1222,48 @@ def main():
     ALL_MODES_ORDERED = ["compute", "vram", "mix", "pcie", "transient", "nvenc", "training", "precision"]
 
     # ── Launch workers ──
+    gpu_indexes = [i for i, _ in selected]
     abort_event = mp.Event()
     workers = []
+    console = Console()
+
+    # The sampler (and its thermal trip) is up before any worker starts
+    # loading, so warm-up is watched like the rest of the run.
+    # start() waits for the first reading so the dashboard never starts empty
+    sampler = Sampler(gpu_indexes)
+    sampler.start()
 
     if mode != "all_sequential":
-        for idx, name in selected:
-            p = mp.Process(
-                target=STRESS_FUNCTIONS[mode],
-                args=(idx, abort_event),
-                daemon=True,
-            )
-            p.start()
-            workers.append(p)
+        workers, ready = _launch_workers(mode, gpu_indexes, abort_event)
+    warm_since = time.time()  # warm-up of the current workers began here
+
+    # ── Report files ── snapshots are spooled to disk as JSON lines while
+    # the test runs, so memory stays flat and a crash still leaves the data.
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    log_dir = os.path.join(base_dir, "log")
+    os.makedirs(log_dir, exist_ok=True)
+
+    ts_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_filename = f"gpu_report_{ts_str}.json"
+    out_path = os.path.join(log_dir, json_filename)
+    snap_path = out_path + ".snapshots.jsonl"
+    snap_f = open(snap_path, "w", encoding="utf-8")
+    n_snapshots = 0
+    # Running per-GPU peaks over the snapshots, updated as each one is taken
+    peaks = {
+        idx: {"max_temp_c": 0, "max_power_w": 0, "max_mem_used_gb": 0, "sum_util": 0, "n": 0}
+        for idx, _ in selected
+    }
 
     # ── Monitoring loop ──
-    console = Console()
+    dashboard = DashboardState(console)
     start_ts = time.time()
     last_snap = start_ts
     status = "Running"
+    # Timed phases (the run in single mode, each slice in sequential mode)
+    # start once warm-up ends; warm-up time is reported separately.
+    warming = True
+    warmup_s = 0.0
 
     report = {
         "test_started": datetime.datetime.now().isoformat(),
@@ -634,7 +1272,7 @@ def main():
             "mode": mode,
             "duration_requested_s": duration_s,
         },
-        "snapshots": [],
+        "snapshots": [],  # filled from the spool file by _write_report
         "result": "unknown",
     }
 
@@ -652,24 +1290,32 @@ def main():
         # Launch the first test
         current_seq_mode = ALL_MODES_ORDERED[0]
         current_mode_label[0] = f"Seq [{1}/{len(ALL_MODES_ORDERED)}] {mode_labels[current_seq_mode]}"
-        seq_start = time.time()
-        for idx, name in selected:
-            p = mp.Process(
-                target=STRESS_FUNCTIONS[current_seq_mode],
-                args=(idx, abort_event),
-                daemon=True,
-            )
-            p.start()
-            workers.append(p)
+        workers, ready = _launch_workers(current_seq_mode, gpu_indexes, abort_event)
+        warm_since = time.time()
+
+    metrics = sampler.latest()
+    shown_second = -1  # header clock second last pushed to the dashboard
 
     try:
+        # Live's own thread paints at UI_REFRESH_HZ; the loop below only
+        # updates the dashboard state when there is something new to show.
         with Live(console=console, screen=True, refresh_per_second=UI_REFRESH_HZ) as live:
             while True:
+                fresh = sampler.fresh.wait(LOOP_TICK_S)
                 now = time.time()
                 elapsed = now - start_ts
 
+                # ── Warm-up ── polled so the checks below keep running meanwhile
+                if warming and _warmup_done(ready, warm_since + _WARMUP_TIMEOUT_S):
+                    warming = False
+                    warmup_s += now - warm_since
+                    seq_start = now
+                # Test clock: wall time minus warm-up, paused while warming up
+                clock = max(0.0, elapsed - warmup_s - (now - warm_since if warming else 0))
+                shown_status = "Aquecendo..." if warming else status
+
                 # ── Sequential mode: advance to next test ──
-                if mode == "all_sequential" and time_per_test > 0:
+                if mode == "all_sequential" and time_per_test > 0 and not warming:
                     seq_elapsed = now - seq_start
                     if seq_elapsed >= time_per_test:
                         # Stop current workers
@@ -686,59 +1332,66 @@ def main():
                             status = "Concluído ✅ (todos os testes)"
                             metrics = [read_gpu_metrics(i) for i, _ in selected]
                             current_mode_label[0] = "Todos (Concluído)"
-                            live.update(build_dashboard(metrics, elapsed, duration_s, status, current_mode_label[0]))
+                            live.update(dashboard.update(metrics, clock, duration_s, status, current_mode_label[0]))
                             time.sleep(0.5)
                             break
 
-                        # Launch next test
+                        # Launch next test; its time slice starts once warm-up is done
                         abort_event = mp.Event()
-                        workers = []
                         current_seq_mode = ALL_MODES_ORDERED[seq_mode_index[0]]
                         current_mode_label[0] = f"Seq [{seq_mode_index[0]+1}/{len(ALL_MODES_ORDERED)}] {mode_labels[current_seq_mode]}"
-                        seq_start = now
-                        for idx, name_gpu in selected:
-                            p = mp.Process(
-                                target=STRESS_FUNCTIONS[current_seq_mode],
-                                args=(idx, abort_event),
-                                daemon=True,
-                            )
-                            p.start()
-                            workers.append(p)
+                        workers, ready = _launch_workers(current_seq_mode, gpu_indexes, abort_event)
+                        warming = True
+                        warm_since = now  # the worker hand-over counts as warm-up
+                        shown_status = "Aquecendo..."
 
                 # ── Duration check (single-mode only) ──
-                if mode != "all_sequential" and duration_s > 0 and elapsed >= duration_s:
+                if mode != "all_sequential" and duration_s > 0 and not warming and clock >= duration_s:
                     status = "Concluído ✅"
                     abort_event.set()
                     # final render
                     metrics = [read_gpu_metrics(i) for i, _ in selected]
-                    live.update(build_dashboard(metrics, elapsed, duration_s, status, current_mode_label[0]))
+                    live.update(dashboard.update(metrics, clock, duration_s, status, current_mode_label[0]))
                     time.sleep(0.5)
                     break
 
-                # ── Collect metrics ──
-                metrics = [read_gpu_metrics(i) for i, _ in selected]
+                # ── Latest metrics from the sampler process ──
+                if fresh:
+                    sampler.fresh.clear()
+                    metrics = sampler.latest()
 
-                # ── Thermal check ──
-                for m in metrics:
-                    if m and m["temp_c"] >= TEMP_LIMIT_C:
-                        status = f"🛑 ABORTADO: GPU {m['idx']} atingiu {m['temp_c']}°C!"
-                        abort_event.set()
-                        live.update(build_dashboard(metrics, elapsed, duration_s, status, current_mode_label[0]))
-                        time.sleep(1)
-                        raise SystemExit(status)
+                # ── Thermal check ── (SystemExit handler sets abort_event)
+                m = sampler.over_limit
+                if m is not None:
+                    status = f"🛑 ABORTADO: GPU {m['idx']} atingiu {m['temp_c']}°C!"
+                    live.update(dashboard.update(metrics, clock, duration_s, status, current_mode_label[0]))
+                    time.sleep(1)
+                    raise SystemExit(status)
 
                 # ── Snapshot for report ──
                 if now - last_snap >= REPORT_INTERVAL:
-                    report["snapshots"].append({
+                    snap_gpus = [_snapshot_gpu(m) for m in metrics if m]
+                    snap_f.write(json.dumps({
                         "ts": datetime.datetime.now().isoformat(),
                         "elapsed_s": round(elapsed, 1),
-                        "gpus": [m for m in metrics if m],
-                    })
+                        "gpus": snap_gpus,
+                    }, separators=(",", ":"), ensure_ascii=False) + "\n")
+                    for g in snap_gpus:
+                        p = peaks[g["idx"]]
+                        p["max_temp_c"] = max(p["max_temp_c"], g["temp_c"])
+                        p["max_power_w"] = max(p["max_power_w"], g["power_w"])
+                        p["max_mem_used_gb"] = max(p["max_mem_used_gb"], g["mem_used_gb"])
+                        p["sum_util"] += g["util_gpu"]
+                        p["n"] += 1
+                    n_snapshots += 1
+                    if n_snapshots % _SPOOL_FLUSH_EVERY == 0:
+                        snap_f.flush()
                     last_snap = now
 
-                # ── Render ──
-                live.update(build_dashboard(metrics, elapsed, duration_s, status, current_mode_label[0]))
-                time.sleep(SAMPLE_INTERVAL)
+                # ── Render ── (new reading, or the header clock ticked over)
+                if fresh or int(clock) != shown_second:
+                    shown_second = int(clock)
+                    live.update(dashboard.update(metrics, clock, duration_s, shown_status, current_mode_label[0]))
 
     except KeyboardInterrupt:
         abort_event.set()
@@ -749,45 +1402,39 @@ def main():
         console.print(f"\n[bold red]{e}[/bold red]")
 
     # ── Cleanup ──
+    sampler.stop()
     abort_event.set()
     for w in workers:
         w.join(timeout=10)
         if w.is_alive():
             w.terminate()
 
+    snap_f.close()
+
     end_ts = time.time()
+    if warming:  # stopped before the last warm-up finished
+        warmup_s += end_ts - warm_since
     report["result"] = status
     report["test_ended"] = datetime.datetime.now().isoformat()
     report["total_elapsed_s"] = round(end_ts - start_ts, 1)
+    report["warmup_s"] = round(warmup_s, 1)
 
     # ── Peak metrics summary ──
-    if report["snapshots"]:
-        for idx, name in selected:
-            gpu_snaps = [
-                g for s in report["snapshots"] for g in s["gpus"] if g["idx"] == idx
-            ]
-            if gpu_snaps:
-                report[f"gpu_{idx}_peak"] = {
-                    "max_temp_c": max(g["temp_c"] for g in gpu_snaps),
-                    "max_power_w": max(g["power_w"] for g in gpu_snaps),
-                    "max_mem_used_gb": max(g["mem_used_gb"] for g in gpu_snaps),
-                    "avg_util_gpu": round(
-                        sum(g["util_gpu"] for g in gpu_snaps) / len(gpu_snaps), 1
-                    ),
-                }
+    for idx, name in selected:
+        p = peaks[idx]
+        if p["n"]:
+            report[f"gpu_{idx}_peak"] = {
+                "max_temp_c": p["max_temp_c"],
+                "max_power_w": p["max_power_w"],
+                "max_mem_used_gb": p["max_mem_used_gb"],
+                "avg_util_gpu": round(p["sum_util"] / p["n"], 1),
+            }
 
     pynvml.nvmlShutdown()
 
     # ── Save JSON to log/ directory ──
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    log_dir = os.path.join(base_dir, "log")
-    os.makedirs(log_dir, exist_ok=True)
-
-    ts_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    json_filename = f"gpu_report_{ts_str}.json"
-    out_path = os.path.join(log_dir, json_filename)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    _write_report(out_path, report, snap_path)
+    os.remove(snap_path)
 
     # ── Update log/index.json manifest ──
     index_path = os.path.join(log_dir, "index.json")
@@ -821,5 +1468,13 @@ def main():
 
 
 if __name__ == "__main__":
-    mp.set_start_method("spawn", force=True)
+    # Workers inherit this before their first `import torch`
+    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", _CUDA_ALLOC_CONF)
+    if "forkserver" in mp.get_all_start_methods():
+        # Workers fork from a server that imported torch once (without touching
+        # CUDA), so every test start skips the multi-second torch import.
+        mp.set_start_method("forkserver", force=True)
+        mp.set_forkserver_preload(["__main__", "torch"])
+    else:
+        mp.set_start_method("spawn", force=True)
     main()
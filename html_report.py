@@ -1,19 +1,98 @@
 #!/usr/bin/env python3
 """
 Generates a self-contained HTML report from GPU stress test JSON data.
-Uses Google Charts + Tailwind CSS via CDN.
+Uses uPlot via CDN; styles are inlined (Tailwind-compatible utility subset).
 """
 
-_HTML_TEMPLATE = r"""<!DOCTYPE html>
+import base64
+import datetime
+import gzip
+import html
+import json
+import re
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The page is assembled from these pieces: reports without snapshots get the
+# minimal template (no chart library, no script, no embedded JSON)
+_HTML_PAGE_START = r"""<!DOCTYPE html>
 <html lang="pt-BR" class="dark">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>GPU Stress Report — {{TITLE}}</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://www.gstatic.com/charts/loader.js"></script>
-    <style>
+"""
+
+_HTML_CHART_LIBS = r"""    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/uplot@1.6.31/dist/uPlot.min.css">
+    <script src="https://cdn.jsdelivr.net/npm/uplot@1.6.31/dist/uPlot.iife.min.js"></script>
+"""
+
+_HTML_PAGE_BODY = r"""    <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;900&family=JetBrains+Mono:wght@400;600&display=swap');
+        /* Only the Tailwind utilities this page uses, with Tailwind's values (no CDN JIT) */
+        *, ::before, ::after { box-sizing: border-box; border: 0 solid #334155; }
+        html { line-height: 1.5; -webkit-text-size-adjust: 100%; }
+        body, h1, h2, h3, p { margin: 0; }
+        h1, h2, h3 { font-size: inherit; font-weight: inherit; }
+        table { border-collapse: collapse; text-indent: 0; border-color: inherit; }
+        th { text-align: inherit; font-weight: inherit; }
+        .min-h-screen { min-height: 100vh; } .max-w-7xl { max-width: 80rem; }
+        .mx-auto { margin-left: auto; margin-right: auto; }
+        .mt-1 { margin-top: .25rem; } .mt-12 { margin-top: 3rem; }
+        .mb-1 { margin-bottom: .25rem; } .mb-2 { margin-bottom: .5rem; } .mb-4 { margin-bottom: 1rem; }
+        .mb-6 { margin-bottom: 1.5rem; } .mb-8 { margin-bottom: 2rem; }
+        .p-3 { padding: .75rem; } .p-4 { padding: 1rem; } .p-5 { padding: 1.25rem; } .p-6 { padding: 1.5rem; }
+        .px-6 { padding-left: 1.5rem; padding-right: 1.5rem; } .py-3 { padding-top: .75rem; padding-bottom: .75rem; }
+        .space-y-3 > :not([hidden]) ~ :not([hidden]) { margin-top: .75rem; }
+        .space-y-6 > :not([hidden]) ~ :not([hidden]) { margin-top: 1.5rem; }
+        .space-y-8 > :not([hidden]) ~ :not([hidden]) { margin-top: 2rem; }
+        .flex { display: flex; } .inline-block { display: inline-block; } .grid { display: grid; }
+        .flex-col { flex-direction: column; } .flex-1 { flex: 1 1 0%; } .items-center { align-items: center; }
+        .grid-cols-1 { grid-template-columns: repeat(1, minmax(0, 1fr)); }
+        .grid-cols-2 { grid-template-columns: repeat(2, minmax(0, 1fr)); }
+        .gap-1 { gap: .25rem; } .gap-2 { gap: .5rem; } .gap-3 { gap: .75rem; } .gap-4 { gap: 1rem; } .gap-6 { gap: 1.5rem; }
+        .w-3 { width: .75rem; } .h-3 { height: .75rem; } .w-16 { width: 4rem; } .w-full { width: 100%; }
+        .overflow-hidden { overflow: hidden; }
+        .rounded { border-radius: .25rem; } .rounded-xl { border-radius: .75rem; } .rounded-2xl { border-radius: 1rem; }
+        .border { border-width: 1px; } .border-b { border-bottom-width: 1px; }
+        .text-left { text-align: left; } .text-center { text-align: center; } .text-right { text-align: right; }
+        .text-\[10px\] { font-size: 10px; }
+        .text-xs { font-size: .75rem; line-height: 1rem; } .text-sm { font-size: .875rem; line-height: 1.25rem; }
+        .text-lg { font-size: 1.125rem; line-height: 1.75rem; } .text-xl { font-size: 1.25rem; line-height: 1.75rem; }
+        .text-2xl { font-size: 1.5rem; line-height: 2rem; } .text-3xl { font-size: 1.875rem; line-height: 2.25rem; }
+        .font-medium { font-weight: 500; } .font-semibold { font-weight: 600; } .font-bold { font-weight: 700; } .font-black { font-weight: 900; }
+        .uppercase { text-transform: uppercase; } .tracking-wider { letter-spacing: .05em; }
+        .text-white { color: #fff; } .text-slate-200 { color: #e2e8f0; } .text-slate-300 { color: #cbd5e1; }
+        .text-slate-400 { color: #94a3b8; } .text-slate-500 { color: #64748b; } .text-slate-600 { color: #475569; }
+        .text-red-400 { color: #f87171; } .text-orange-400 { color: #fb923c; } .text-yellow-400 { color: #facc15; }
+        .text-green-400 { color: #4ade80; } .text-cyan-400 { color: #22d3ee; } .text-purple-400 { color: #c084fc; }
+        .bg-red-500 { background-color: #ef4444; } .bg-orange-500 { background-color: #f97316; }
+        .bg-yellow-500 { background-color: #eab308; } .bg-green-500 { background-color: #22c55e; }
+        .bg-emerald-400 { background-color: #34d399; } .bg-cyan-500 { background-color: #06b6d4; }
+        .bg-red-500\/20 { background-color: rgb(239 68 68 / .2); } .bg-yellow-500\/20 { background-color: rgb(234 179 8 / .2); }
+        .bg-green-500\/20 { background-color: rgb(34 197 94 / .2); }
+        .border-red-500\/30 { border-color: rgb(239 68 68 / .3); } .border-yellow-500\/30 { border-color: rgb(234 179 8 / .3); }
+        .border-green-500\/30 { border-color: rgb(34 197 94 / .3); } .border-blue-500\/20 { border-color: rgb(59 130 246 / .2); }
+        .border-purple-500\/20 { border-color: rgb(168 85 247 / .2); } .border-slate-500\/20 { border-color: rgb(100 116 139 / .2); }
+        .border-cyan-500\/20 { border-color: rgb(6 182 212 / .2); } .border-slate-700\/50 { border-color: rgb(51 65 85 / .5); }
+        .border-slate-800\/50 { border-color: rgb(30 41 59 / .5); }
+        .transition-colors { transition: color, background-color, border-color .15s cubic-bezier(.4, 0, .2, 1); }
+        .hover\:bg-slate-800\/30:hover { background-color: rgb(30 41 59 / .3); }
+        @media (min-width: 768px) {
+            .md\:p-8 { padding: 2rem; } .md\:flex-row { flex-direction: row; }
+            .md\:items-center { align-items: center; } .md\:justify-between { justify-content: space-between; }
+            .md\:grid-cols-4 { grid-template-columns: repeat(4, minmax(0, 1fr)); }
+            .md\:grid-cols-5 { grid-template-columns: repeat(5, minmax(0, 1fr)); }
+            .md\:text-4xl { font-size: 2.25rem; line-height: 2.5rem; }
+        }
+        @media (min-width: 1024px) {
+            .lg\:grid-cols-2 { grid-template-columns: repeat(2, minmax(0, 1fr)); }
+        }
         body { font-family: 'Inter', sans-serif; background: #0a0e1a; color: #e2e8f0; }
         .mono { font-family: 'JetBrains Mono', monospace; }
         .glass { background: rgba(15, 23, 42, 0.8); backdrop-filter: blur(16px); border: 1px solid rgba(148, 163, 184, 0.1); }
@@ -25,8 +104,8 @@ _HTML_TEMPLATE = r"""<!DOCTYPE html>
         .gradient-text { background: linear-gradient(135deg, #60a5fa, #a78bfa, #f472b6); -webkit-background-clip: text; -webkit-text-fill-color: transparent; }
         .stat-value { font-size: 2rem; font-weight: 900; line-height: 1; }
         .chart-container { width: 100%; height: 300px; }
-        .heatmap-cell { width: 100%; height: 32px; display: flex; gap: 1px; }
-        .heatmap-cell div { flex: 1; border-radius: 2px; min-width: 2px; }
+        .chart-container .u-axis { color: #64748b; }
+        .heatmap-cell { width: 100%; height: 32px; border-radius: 2px; }
         /* Animate cards on load */
         @keyframes fadeUp { from { opacity: 0; transform: translateY(20px); } to { opacity: 1; transform: translateY(0); } }
         .animate-card { animation: fadeUp 0.5s ease-out forwards; opacity: 0; }
@@ -40,55 +119,44 @@ _HTML_TEMPLATE = r"""<!DOCTYPE html>
 </head>
 <body class="min-h-screen p-4 md:p-8">
 
-<script>
-const REPORT = {{JSON_DATA}};
-</script>
-
 <!-- Header -->
 <header class="max-w-7xl mx-auto mb-8">
     <div class="glass rounded-2xl p-6 md:p-8">
         <div class="flex flex-col md:flex-row md:items-center md:justify-between gap-4">
-            <div>
-                <h1 class="text-3xl md:text-4xl font-black gradient-text mb-2">🔥 GPU Stress Report</h1>
-                <p class="text-slate-400 text-lg" id="subtitle"></p>
-            </div>
-            <div id="verdict-badge" class="px-6 py-3 rounded-xl text-xl font-bold text-center"></div>
+{{HEADER_HTML}}
         </div>
     </div>
 </header>
 
 <!-- Summary Cards -->
 <section class="max-w-7xl mx-auto mb-8">
-    <div class="grid grid-cols-2 md:grid-cols-4 gap-4" id="summary-cards"></div>
+    <div class="grid grid-cols-2 md:grid-cols-4 gap-4" id="summary-cards">{{SUMMARY_CARDS_HTML}}</div>
 </section>
 
-<!-- GPU Sections -->
+"""
+
+_HTML_GPU_SECTIONS = r"""<!-- GPU Sections -->
 <div id="gpu-sections" class="max-w-7xl mx-auto space-y-8"></div>
 
-<!-- Footer -->
+"""
+
+_HTML_FOOTER = r"""<!-- Footer -->
 <footer class="max-w-7xl mx-auto mt-12 mb-8">
     <div class="text-center text-slate-600 text-sm">
-        <p>Gerado por <span class="font-semibold text-slate-500">GPU Stress Tester</span> — <span id="footer-date"></span></p>
+        <p>Gerado por <span class="font-semibold text-slate-500">GPU Stress Tester</span> — <span id="footer-date">{{FOOTER_DATE}}</span></p>
     </div>
 </footer>
 
-<script>
-// ─── Helpers ───
-
-const MODE_LABELS = {
-    compute: "Compute (CUDA Cores)", vram: "VRAM (Memória)", mix: "Misto (Compute+VRAM)",
-    pcie: "PCIe / NVLink", transient: "Picos de Energia", nvenc: "NVENC / Vídeo",
-    training: "Treinamento IA", precision: "Precisão FP64/INT8", all_sequential: "Todos em Sequência",
-};
+"""
 
-function fmtDuration(s) {
-    const h = Math.floor(s / 3600), m = Math.floor((s % 3600) / 60), sec = Math.floor(s % 60);
-    return `${h > 0 ? h + 'h ' : ''}${m}m ${sec}s`;
-}
+_HTML_SCRIPTS = r"""<script>
+const REPORT = {{JSON_DATA}};
+// Detail table rows: [label, stats key, unit]
+const TABLE_METRICS = {{TABLE_METRICS}};
+</script>
 
-function fmtDate(iso) {
-    try { const d = new Date(iso); return d.toLocaleString('pt-BR'); } catch { return iso; }
-}
+<script>
+// ─── Helpers ───
 
 function tempColor(t) {
     if (t >= 90) return { text: 'text-red-400', bg: 'bg-red-500' };
@@ -98,111 +166,55 @@ function tempColor(t) {
     return { text: 'text-cyan-400', bg: 'bg-cyan-500' };
 }
 
-function getGpuSnapshots(gpuIdx) {
-    const snaps = [];
-    for (const s of REPORT.snapshots || []) {
-        for (const g of s.gpus || []) {
-            if (g.idx === gpuIdx) snaps.push({ ...g, elapsed_s: s.elapsed_s, ts: s.ts });
-        }
-    }
-    return snaps;
-}
-
-function calcStats(values) {
-    if (!values.length) return { min: 0, max: 0, avg: 0 };
-    const min = Math.min(...values), max = Math.max(...values);
-    const avg = values.reduce((a, b) => a + b, 0) / values.length;
-    return { min, max, avg: Math.round(avg * 10) / 10 };
+// Stats of a metric with no readings (e.g. fan on water-cooled cards)
+const NO_STATS = { min: 0, max: 0, avg: 0 };
+// Plotted per-GPU arrays; each ships as a JSON list or a base64 little-endian
+// blob (whichever was shorter) and becomes a typed array once at boot
+const SERIES_KEYS = ['temp_c', 'power_w', 'util_gpu', 'mem_used_gb'];
+
+function b64Bytes(b64) {
+    const bin = atob(b64);
+    const bytes = new Uint8Array(bin.length);
+    for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+    return bytes.buffer;
 }
 
-// ─── Render Header ───
-
-function renderHeader() {
-    const cfg = REPORT.config || {};
-    const mode = MODE_LABELS[cfg.mode] || cfg.mode;
-    const gpus = (cfg.gpus || []).map(g => `GPU ${g[0]}: ${g[1]}`).join(', ');
-    document.getElementById('subtitle').textContent =
-        `${mode} — ${gpus} — ${fmtDuration(REPORT.total_elapsed_s || 0)}`;
+// [..] / {_f32: ...} / {_f64: ...} -> typed array; null readings become NaN
+function f32(o) { return Array.isArray(o) ? Float32Array.from(o, v => v ?? NaN) : new Float32Array(b64Bytes(o._f32)); }
+function f64(o) { return Array.isArray(o) ? Float64Array.from(o, v => v ?? NaN) : new Float64Array(b64Bytes(o._f64)); }
 
-    // Verdict
-    const maxTemps = [];
-    for (const key of Object.keys(REPORT)) {
-        if (key.startsWith('gpu_') && key.endsWith('_peak')) {
-            maxTemps.push(REPORT[key].max_temp_c || 0);
-        }
-    }
-    const peakTemp = maxTemps.length ? Math.max(...maxTemps) : 0;
-    const badge = document.getElementById('verdict-badge');
-    const result = REPORT.result || '';
-
-    if (result.includes('ABORTADO') || peakTemp >= 95) {
-        badge.textContent = '🔴 REPROVADO';
-        badge.className = 'px-6 py-3 rounded-xl text-xl font-bold text-center bg-red-500/20 text-red-400 border border-red-500/30 glow-red';
-    } else if (peakTemp >= 85 || result.includes('Interrompido')) {
-        badge.textContent = '🟡 ATENÇÃO';
-        badge.className = 'px-6 py-3 rounded-xl text-xl font-bold text-center bg-yellow-500/20 text-yellow-400 border border-yellow-500/30 glow-yellow';
-    } else {
-        badge.textContent = '🟢 APROVADO';
-        badge.className = 'px-6 py-3 rounded-xl text-xl font-bold text-center bg-green-500/20 text-green-400 border border-green-500/30 glow-green';
+function typeSeries() {
+    for (const series of Object.values(REPORT.series || {})) {
+        for (const k of SERIES_KEYS) series[k] = f32(series[k]);
+        series.elapsed = f64(series.elapsed);
+        if (series.x) for (const k in series.x) series.x[k] = f64(series.x[k]);
     }
-
-    document.getElementById('footer-date').textContent = fmtDate(REPORT.test_started);
-}
-
-// ─── Summary Cards ───
-
-function renderSummaryCards() {
-    const cfg = REPORT.config || {};
-    const cards = [
-        { icon: '🔧', label: 'Modo', value: MODE_LABELS[cfg.mode] || cfg.mode, color: 'blue' },
-        { icon: '⏱️', label: 'Duração', value: fmtDuration(REPORT.total_elapsed_s || 0), color: 'purple' },
-        { icon: '📅', label: 'Início', value: fmtDate(REPORT.test_started), color: 'slate' },
-        { icon: '📊', label: 'Amostras', value: (REPORT.snapshots || []).length.toString(), color: 'cyan' },
-    ];
-
-    const container = document.getElementById('summary-cards');
-    cards.forEach((c, i) => {
-        const colorMap = {
-            blue: 'border-blue-500/20', purple: 'border-purple-500/20',
-            slate: 'border-slate-500/20', cyan: 'border-cyan-500/20',
-        };
-        container.innerHTML += `
-            <div class="glass-card rounded-xl p-5 border ${colorMap[c.color]} animate-card">
-                <div class="text-2xl mb-2">${c.icon}</div>
-                <div class="text-xs uppercase tracking-wider text-slate-500 mb-1">${c.label}</div>
-                <div class="text-lg font-bold text-slate-200">${c.value}</div>
-            </div>
-        `;
-    });
 }
 
 // ─── GPU Section ───
 
-function renderGpuSection(gpuIdx, gpuName) {
-    const snaps = getGpuSnapshots(gpuIdx);
-    if (!snaps.length) return;
-
-    const peakKey = `gpu_${gpuIdx}_peak`;
-    const peak = REPORT[peakKey] || {};
-
-    const temps = snaps.map(s => s.temp_c);
-    const powers = snaps.map(s => s.power_w);
-    const utils = snaps.map(s => s.util_gpu);
-    const vrams = snaps.map(s => s.mem_used_gb);
-    const vramPcts = snaps.map(s => s.mem_pct);
-    const fans = snaps.map(s => s.fan_pct);
-    const coreClks = snaps.map(s => s.clock_core_mhz);
-    const memClks = snaps.map(s => s.clock_mem_mhz);
-    const elapsed = snaps.map(s => s.elapsed_s);
-
-    const tStats = calcStats(temps);
-    const pStats = calcStats(powers);
-    const uStats = calcStats(utils);
-    const vStats = calcStats(vrams);
-    const fStats = calcStats(fans);
+function renderGpuSection(container, gpuIdx, gpuName) {
+    // Series and stats are pivoted per GPU by generate_html_report
+    const series = (REPORT.series || {})[gpuIdx];
+    if (!series || !series.elapsed.length) return;
+
+    const temps = series.temp_c;
+    const powers = series.power_w;
+    const utils = series.util_gpu;
+    const vrams = series.mem_used_gb;
+    const elapsed = series.elapsed;
+    // Downsampled series carry their own x values (LTTB keeps different points per metric)
+    const xOf = key => (series.x && series.x[key]) || elapsed;
+
+    const stats = series.stats;
+    const tStats = stats.temp_c || NO_STATS;
+    const pStats = stats.power_w || NO_STATS;
+    const uStats = stats.util_gpu || NO_STATS;
+    const vStats = stats.mem_used_gb || NO_STATS;
+    const fStats = stats.fan_pct;  // null when no fan reading was valid
 
     const tc = tempColor(tStats.max);
-    const totalVram = snaps[0]?.mem_total_gb || 0;
+    const totalVram = series.mem_total_gb || 0;
 
     const section = document.createElement('div');
     section.className = 'space-y-6';
@@ -236,8 +248,8 @@ function renderGpuSection(gpuIdx, gpuName) {
                 </div>
                 <div class="glass-card rounded-xl p-4 animate-card">
                     <div class="text-xs uppercase tracking-wider text-slate-500 mb-1">🌀 Fan Máx</div>
-                    <div class="stat-value text-cyan-400">${fStats.max >= 0 ? fStats.max + '%' : 'N/A'}</div>
-                    <div class="text-xs text-slate-500 mt-1">${fStats.max >= 0 ? 'avg ' + fStats.avg + '%' : 'water cooled?'}</div>
+                    <div class="stat-value text-cyan-400">${fStats ? fStats.max + '%' : 'N/A'}</div>
+                    <div class="text-xs text-slate-500 mt-1">${fStats ? 'avg ' + fStats.avg + '%' : 'water cooled?'}</div>
                 </div>
             </div>
 
@@ -321,155 +333,526 @@ function renderGpuSection(gpuIdx, gpuName) {
         </div>
     `;
 
-    document.getElementById('gpu-sections').appendChild(section);
+    container.appendChild(section);
+    // Handles into the section just built: the builders below take elements, not ids
+    const [chartTemp, chartPower, chartLoad, chartVram] = section.querySelectorAll('.chart-container');
+    const [heatTemp, heatLoad, heatPower] = section.querySelectorAll('.heatmap-cell');
 
     // ── Fill Table ──
-    const metrics = [
-        { label: '🌡️ Temperatura', values: temps, unit: '°C' },
-        { label: '⚡ Potência', values: powers, unit: ' W' },
-        { label: '📊 GPU Load', values: utils, unit: '%' },
-        { label: '💾 VRAM Usada', values: vrams, unit: ' GB' },
-        { label: '💾 VRAM %', values: vramPcts, unit: '%' },
-        { label: '🌀 Fan', values: fans.filter(f => f >= 0), unit: '%' },
-        { label: '🕐 Core Clk', values: coreClks, unit: ' MHz' },
-        { label: '🕐 Mem Clk', values: memClks, unit: ' MHz' },
-    ];
-
-    const tbody = document.getElementById(`table-${gpuIdx}`);
-    metrics.forEach(m => {
-        if (!m.values.length) return;
-        const s = calcStats(m.values);
-        tbody.innerHTML += `
+    let rows = '';
+    for (const [label, key, unit] of TABLE_METRICS) {
+        const s = stats[key];
+        if (!s) continue;
+        rows += `
             <tr class="border-b border-slate-800/50 hover:bg-slate-800/30 transition-colors">
-                <td class="p-3 text-slate-300">${m.label}</td>
-                <td class="p-3 text-right text-green-400">${s.min}${m.unit}</td>
-                <td class="p-3 text-right text-yellow-400">${s.avg}${m.unit}</td>
-                <td class="p-3 text-right text-red-400">${s.max}${m.unit}</td>
+                <td class="p-3 text-slate-300">${label}</td>
+                <td class="p-3 text-right text-green-400">${s.min}${unit}</td>
+                <td class="p-3 text-right text-yellow-400">${s.avg}${unit}</td>
+                <td class="p-3 text-right text-red-400">${s.max}${unit}</td>
             </tr>
         `;
-    });
+    }
+    section.querySelector('tbody').innerHTML = rows;
 
     // ── Heatmaps ──
-    buildHeatmap(`heatmap-temp-${gpuIdx}`, temps, [
+    buildHeatmap(heatTemp, temps, [
         [90, '#ef4444'], [80, '#f59e0b'], [70, '#eab308'], [60, '#22c55e'], [0, '#06b6d4']
     ]);
-    buildHeatmap(`heatmap-load-${gpuIdx}`, utils, [
+    buildHeatmap(heatLoad, utils, [
         [95, '#34d399'], [70, '#22c55e'], [40, '#eab308'], [0, '#ef4444']
     ]);
     const maxPwr = pStats.max || 1;
-    buildHeatmapRelative(`heatmap-power-${gpuIdx}`, powers, maxPwr, [
+    buildHeatmapRelative(heatPower, powers, maxPwr, [
         [0.9, '#ef4444'], [0.7, '#eab308'], [0.4, '#22c55e'], [0, '#475569']
     ]);
 
-    // ── Google Charts ──
-    drawLineChart(`chart-temp-${gpuIdx}`, elapsed, temps, 'Temp (°C)', '#f97316', [tStats.min - 5, tStats.max + 5]);
-    drawLineChart(`chart-power-${gpuIdx}`, elapsed, powers, 'Power (W)', '#eab308', [0, pStats.max * 1.1]);
-    drawLineChart(`chart-load-${gpuIdx}`, elapsed, utils, 'GPU Load (%)', '#22c55e', [0, 105]);
-    drawAreaChart(`chart-vram-${gpuIdx}`, elapsed, vrams, `VRAM (GB)`, '#a855f7', [0, totalVram]);
+    // ── Charts (drawn once they scroll near the viewport) ──
+    queueChart(drawLineChart, chartTemp, xOf('temp_c'), temps, 'Temp (°C)', '#f97316', [tStats.min - 5, tStats.max + 5]);
+    queueChart(drawLineChart, chartPower, xOf('power_w'), powers, 'Power (W)', '#eab308', [0, pStats.max * 1.1]);
+    queueChart(drawLineChart, chartLoad, xOf('util_gpu'), utils, 'GPU Load (%)', '#22c55e', [0, 105]);
+    queueChart(drawAreaChart, chartVram, xOf('mem_used_gb'), vrams, `VRAM (GB)`, '#a855f7', [0, totalVram]);
 }
 
 // ─── Heatmap / Charts ───
 
-function buildHeatmap(containerId, values, thresholds) {
-    const container = document.getElementById(containerId);
-    if (!container) return;
-    const maxBlocks = 200;
-    const step = Math.max(1, Math.floor(values.length / maxBlocks));
-    for (let i = 0; i < values.length; i += step) {
-        const v = values[i];
-        let color = thresholds[thresholds.length - 1][1];
-        for (const [limit, c] of thresholds) {
-            if (v >= limit) { color = c; break; }
-        }
-        const el = document.createElement('div');
-        el.style.backgroundColor = color;
-        el.title = `${v}`;
-        container.appendChild(el);
+function thresholdColor(v, thresholds) {
+    for (const [limit, c] of thresholds) {
+        if (v >= limit) return c;
     }
+    return thresholds[thresholds.length - 1][1];
 }
 
-function buildHeatmapRelative(containerId, values, maxVal, thresholds) {
-    const container = document.getElementById(containerId);
-    if (!container) return;
+// One element per heatmap: the blocks are hard stops of a single
+// linear-gradient, and one mousemove handler maps X back to a block
+function paintHeatmap(container, values, colorOf, label) {
+    if (!container || !values.length) return;
     const maxBlocks = 200;
     const step = Math.max(1, Math.floor(values.length / maxBlocks));
-    for (let i = 0; i < values.length; i += step) {
-        const ratio = maxVal > 0 ? values[i] / maxVal : 0;
-        let color = thresholds[thresholds.length - 1][1];
-        for (const [limit, c] of thresholds) {
-            if (ratio >= limit) { color = c; break; }
-        }
-        const el = document.createElement('div');
-        el.style.backgroundColor = color;
-        el.title = `${values[i]} W`;
-        container.appendChild(el);
+    const n = Math.ceil(values.length / step);
+    const stops = [];
+    for (let b = 0; b < n; b++) {
+        const color = colorOf(values[b * step]);
+        stops.push(`${color} ${(b / n) * 100}%`, `${color} ${((b + 1) / n) * 100}%`);
     }
+    container.style.background = `linear-gradient(to right, ${stops.join(',')})`;
+    container.addEventListener('mousemove', e => {
+        const rect = container.getBoundingClientRect();
+        const b = Math.min(n - 1, Math.max(0, Math.floor((e.clientX - rect.left) / rect.width * n)));
+        container.title = label(values[b * step]);
+    });
 }
 
-function drawLineChart(containerId, xVals, yVals, label, color, vAxisRange) {
-    const data = new google.visualization.DataTable();
-    data.addColumn('number', 'Tempo (s)');
-    data.addColumn('number', label);
-    for (let i = 0; i < xVals.length; i++) data.addRow([xVals[i], yVals[i]]);
-
-    const options = {
-        backgroundColor: 'transparent', chartArea: { left: 60, top: 20, right: 20, bottom: 40, width: '100%', height: '80%' },
-        colors: [color], legend: 'none', lineWidth: 2, curveType: 'function',
-        hAxis: { title: 'Tempo (s)', textStyle: { color: '#64748b', fontSize: 10 }, titleTextStyle: { color: '#64748b', fontSize: 11 }, gridlines: { color: '#1e293b' }, baselineColor: '#1e293b' },
-        vAxis: { viewWindow: { min: vAxisRange[0], max: vAxisRange[1] }, textStyle: { color: '#64748b', fontSize: 10 }, gridlines: { color: '#1e293b' }, baselineColor: '#1e293b' },
-        tooltip: { textStyle: { fontSize: 12 } },
-    };
+function buildHeatmap(el, values, thresholds) {
+    paintHeatmap(el, values, v => thresholdColor(v, thresholds), v => `${v}`);
+}
 
-    const chart = new google.visualization.LineChart(document.getElementById(containerId));
-    chart.draw(data, options);
+function buildHeatmapRelative(el, values, maxVal, thresholds) {
+    paintHeatmap(el, values,
+        v => thresholdColor(maxVal > 0 ? v / maxVal : 0, thresholds),
+        v => `${Math.round(v * 10) / 10} W`);  // Float32 -> 1 decimal
 }
 
-function drawAreaChart(containerId, xVals, yVals, label, color, vAxisRange) {
-    const data = new google.visualization.DataTable();
-    data.addColumn('number', 'Tempo (s)');
-    data.addColumn('number', label);
-    for (let i = 0; i < xVals.length; i++) data.addRow([xVals[i], yVals[i]]);
-
-    const options = {
-        backgroundColor: 'transparent', chartArea: { left: 60, top: 20, right: 20, bottom: 40, width: '100%', height: '80%' },
-        colors: [color], legend: 'none', lineWidth: 2, curveType: 'function', areaOpacity: 0.15,
-        hAxis: { title: 'Tempo (s)', textStyle: { color: '#64748b', fontSize: 10 }, titleTextStyle: { color: '#64748b', fontSize: 11 }, gridlines: { color: '#1e293b' }, baselineColor: '#1e293b' },
-        vAxis: { viewWindow: { min: vAxisRange[0], max: vAxisRange[1] }, textStyle: { color: '#64748b', fontSize: 10 }, gridlines: { color: '#1e293b' }, baselineColor: '#1e293b' },
-        tooltip: { textStyle: { fontSize: 12 } },
+// Lazy chart drawing: container element -> pending draw, queued on first intersection
+const pendingCharts = new Map();
+let chartObserver = null;
+
+// Visible charts are drawn in idle slices, one at least per slice, so a
+// screenful of charts never blocks scrolling or input in one long task
+const drawQueue = [];
+let drawScheduled = false;
+const idle = window.requestIdleCallback || (fn => setTimeout(() => fn({ timeRemaining: () => 8 }), 0));
+
+function scheduleDraw(job) {
+    drawQueue.push(job);
+    if (drawScheduled) return;
+    drawScheduled = true;
+    idle(drainDrawQueue);
+}
+
+function drainDrawQueue(deadline) {
+    do {
+        drawQueue.shift()();
+    } while (drawQueue.length && deadline.timeRemaining() > 4);
+    if (drawQueue.length) idle(drainDrawQueue);
+    else drawScheduled = false;
+}
+
+function queueChart(draw, el, ...args) {
+    if (!el) return;
+    if (!('IntersectionObserver' in window)) {
+        draw(el, ...args);
+        return;
+    }
+    chartObserver ??= new IntersectionObserver(entries => {
+        for (const e of entries) {
+            if (!e.isIntersecting) continue;
+            chartObserver.unobserve(e.target);
+            const job = pendingCharts.get(e.target);
+            pendingCharts.delete(e.target);
+            if (job) scheduleDraw(job);
+        }
+    }, { rootMargin: '200px' });
+    pendingCharts.set(el, () => draw(el, ...args));
+    chartObserver.observe(el);
+}
+
+const CHART_HEIGHT = 300;
+const CHART_AXIS = { stroke: '#64748b', font: '10px Inter, sans-serif', grid: { stroke: '#1e293b', width: 1 }, ticks: { stroke: '#1e293b' } };
+
+// uPlot draws on a single <canvas>: no per-point SVG nodes
+function drawChart(el, xVals, yVals, label, color, vAxisRange, fill) {
+    const opts = {
+        width: el.clientWidth || 600,
+        height: CHART_HEIGHT,
+        legend: { show: false },
+        cursor: { points: { size: 6 } },
+        scales: { x: { time: false }, y: { range: vAxisRange } },
+        axes: [
+            { ...CHART_AXIS, label: 'Tempo (s)', labelFont: '11px Inter, sans-serif' },
+            { ...CHART_AXIS, size: 60 },
+        ],
+        series: [
+            { label: 'Tempo (s)' },
+            { label, stroke: color, width: 2, fill, paths: uPlot.paths.spline() },
+        ],
     };
+    new uPlot(opts, [xVals, yVals], el);
+}
+
+function drawLineChart(el, xVals, yVals, label, color, vAxisRange) {
+    drawChart(el, xVals, yVals, label, color, vAxisRange);
+}
 
-    const chart = new google.visualization.AreaChart(document.getElementById(containerId));
-    chart.draw(data, options);
+function drawAreaChart(el, xVals, yVals, label, color, vAxisRange) {
+    drawChart(el, xVals, yVals, label, color, vAxisRange, color + '26');  // ~15% alpha
 }
 
 // ─── Init ───
 
-google.charts.load('current', { packages: ['corechart'] });
-google.charts.setOnLoadCallback(() => {
-    renderHeader();
-    renderSummaryCards();
+document.addEventListener('DOMContentLoaded', () => {
+    typeSeries();
+    const sections = document.getElementById('gpu-sections');
     for (const [idx, name] of (REPORT.config?.gpus || [])) {
-        renderGpuSection(idx, name);
+        renderGpuSection(sections, idx, name);
     }
 });
 </script>
-</body>
+"""
+
+_HTML_PAGE_END = r"""</body>
 </html>"""
 
+_HTML_TEMPLATE_FULL = (
+    _HTML_PAGE_START + _HTML_CHART_LIBS + _HTML_PAGE_BODY
+    + _HTML_GPU_SECTIONS + _HTML_FOOTER + _HTML_SCRIPTS + _HTML_PAGE_END
+)
+_HTML_TEMPLATE_MINIMAL = _HTML_PAGE_START + _HTML_PAGE_BODY + _HTML_FOOTER + _HTML_PAGE_END
+
+
+# Per-GPU arrays the page plots (charts and heatmaps)
+_SERIES_KEYS = ("temp_c", "power_w", "util_gpu", "mem_used_gb")
+# Metrics summarised as {min, max, avg} for the stat cards and the detail table
+_STAT_KEYS = (
+    "temp_c", "power_w", "util_gpu", "mem_used_gb",
+    "mem_pct", "fan_pct", "clock_core_mhz", "clock_mem_mhz",
+)
+# Rows of the per-GPU detail table: (label, stats key, unit)
+_TABLE_METRICS = (
+    ("🌡️ Temperatura", "temp_c", "°C"),
+    ("⚡ Potência", "power_w", " W"),
+    ("📊 GPU Load", "util_gpu", "%"),
+    ("💾 VRAM Usada", "mem_used_gb", " GB"),
+    ("💾 VRAM %", "mem_pct", "%"),
+    ("🌀 Fan", "fan_pct", "%"),
+    ("🕐 Core Clk", "clock_core_mhz", " MHz"),
+    ("🕐 Mem Clk", "clock_mem_mhz", " MHz"),
+)
+# Points kept per plotted series; longer runs are downsampled with LTTB
+_LTTB_TARGET = 2000
+
+
+def _pivot_snapshots(snapshots):
+    """
+    Walk the snapshot list once, collecting every plotted or summarised
+    metric per GPU. Returns {gpu_idx: {"elapsed": [...], key: [...],
+    "mem_total_gb": float}}; a reading without the key stores None.
+    """
+    keys = tuple(dict.fromkeys(_SERIES_KEYS + _STAT_KEYS))
+    # One pass only groups the reading dicts per GPU; each column is then
+    # a single list comprehension over that GPU's readings
+    readings = {}
+    elapsed = {}
+    for snap in snapshots:
+        t = snap.get("elapsed_s")
+        for g in snap.get("gpus", ()):
+            gpu_readings = readings.get(g["idx"])
+            if gpu_readings is None:
+                gpu_readings = readings[g["idx"]] = []
+                elapsed[g["idx"]] = []
+            gpu_readings.append(g)
+            elapsed[g["idx"]].append(t)
+
+    per_gpu = {}
+    for idx, gpu_readings in readings.items():
+        entry = per_gpu[idx] = {"elapsed": elapsed[idx], "mem_total_gb": gpu_readings[0].get("mem_total_gb", 0)}
+        for key in keys:
+            entry[key] = [g.get(key) for g in gpu_readings]
+    return per_gpu
+
+
+def _series_stats(values, key):
+    """{min, max, avg} of one metric, vectorised; None if it has no valid reading."""
+    arr = np.array(values, dtype=np.float64)  # None -> NaN
+    valid = arr >= 0 if key == "fan_pct" else ~np.isnan(arr)  # fan < 0: no fan
+    if not valid.all():
+        arr = arr[valid]
+    if not arr.size:
+        return None
+    return {"min": float(arr.min()), "max": float(arr.max()), "avg": round(float(arr.mean()), 1)}
+
+
+def _pivot_series(snapshots):
+    """
+    Per-GPU page data: the arrays the charts and heatmaps plot, plus the
+    min/max/avg of every table metric. Returns {gpu_idx: {"elapsed": [...],
+    <series key>: [...], "mem_total_gb": float, "stats": {key: stats or None}}}.
+    """
+    series = {}
+    for idx, cols in _pivot_snapshots(snapshots).items():
+        entry = {"elapsed": cols["elapsed"], "mem_total_gb": cols["mem_total_gb"]}
+        for key in _SERIES_KEYS:
+            entry[key] = cols[key]
+        entry["stats"] = {key: _series_stats(cols[key], key) for key in _STAT_KEYS}
+        series[idx] = entry
+    return series
+
+
+# Header, verdict and summary cards are known when the report is written,
+# so they are rendered here instead of by the page script
+_MODE_LABELS = {
+    "compute": "Compute (CUDA Cores)", "vram": "VRAM (Memória)", "mix": "Misto (Compute+VRAM)",
+    "pcie": "PCIe / NVLink", "transient": "Picos de Energia", "nvenc": "NVENC / Vídeo",
+    "training": "Treinamento IA", "precision": "Precisão FP64/INT8", "all_sequential": "Todos em Sequência",
+}
+
+_BADGE_CLASS = "px-6 py-3 rounded-xl text-xl font-bold text-center"
+_VERDICTS = {
+    "fail": ("🔴 REPROVADO", "bg-red-500/20 text-red-400 border border-red-500/30 glow-red"),
+    "warn": ("🟡 ATENÇÃO", "bg-yellow-500/20 text-yellow-400 border border-yellow-500/30 glow-yellow"),
+    "pass": ("🟢 APROVADO", "bg-green-500/20 text-green-400 border border-green-500/30 glow-green"),
+}
+
+_CARD_BORDERS = {
+    "blue": "border-blue-500/20", "purple": "border-purple-500/20",
+    "slate": "border-slate-500/20", "cyan": "border-cyan-500/20",
+}
+
+
+def _fmt_duration(s):
+    s = int(s)
+    h, m, sec = s // 3600, s % 3600 // 60, s % 60
+    return f"{f'{h}h ' if h > 0 else ''}{m}m {sec}s"
 
-def generate_html_report(report_data, output_path):
-    """Generate a self-contained HTML report from a report dict."""
-    import json
 
+def _fmt_date(iso):
+    """ISO timestamp as pt-BR "dd/mm/aaaa, hh:mm:ss"; the raw string if unparseable."""
+    try:
+        return datetime.datetime.fromisoformat(iso).strftime("%d/%m/%Y, %H:%M:%S")
+    except (TypeError, ValueError):
+        return iso or ""
+
+
+def _peak_temps(report_data):
+    """max_temp_c of every gpu_N_peak summary, for the verdict."""
+    return [
+        v.get("max_temp_c") or 0
+        for k, v in report_data.items()
+        if k.startswith("gpu_") and k.endswith("_peak")
+    ]
+
+
+def _verdict(report_data):
+    """Key into _VERDICTS from the run result and the hottest GPU peak."""
+    peak_temp = max(_peak_temps(report_data), default=0)
+    result = report_data.get("result") or ""
+    if "ABORTADO" in result or peak_temp >= 95:
+        return "fail"
+    if peak_temp >= 85 or "Interrompido" in result:
+        return "warn"
+    return "pass"
+
+
+def _header_html(report_data):
+    cfg = report_data.get("config", {})
+    mode = _MODE_LABELS.get(cfg.get("mode"), cfg.get("mode", "?"))
+    gpus = ", ".join(f"GPU {idx}: {name}" for idx, name in cfg.get("gpus", []))
+    subtitle = f"{mode} — {gpus} — {_fmt_duration(report_data.get('total_elapsed_s') or 0)}"
+    label, colors = _VERDICTS[_verdict(report_data)]
+    return (
+        f'            <div>\n'
+        f'                <h1 class="text-3xl md:text-4xl font-black gradient-text mb-2">🔥 GPU Stress Report</h1>\n'
+        f'                <p class="text-slate-400 text-lg" id="subtitle">{html.escape(subtitle)}</p>\n'
+        f'            </div>\n'
+        f'            <div id="verdict-badge" class="{_BADGE_CLASS} {colors}">{label}</div>'
+    )
+
+
+def _summary_cards_html(report_data, n_snapshots):
+    cfg = report_data.get("config", {})
+    cards = (
+        ("🔧", "Modo", _MODE_LABELS.get(cfg.get("mode"), cfg.get("mode", "?")), "blue"),
+        ("⏱️", "Duração", _fmt_duration(report_data.get("total_elapsed_s") or 0), "purple"),
+        ("📅", "Início", _fmt_date(report_data.get("test_started")), "slate"),
+        ("📊", "Amostras", str(n_snapshots), "cyan"),
+    )
+    return "".join(
+        f"""
+            <div class="glass-card rounded-xl p-5 border {_CARD_BORDERS[color]} animate-card">
+                <div class="text-2xl mb-2">{icon}</div>
+                <div class="text-xs uppercase tracking-wider text-slate-500 mb-1">{label}</div>
+                <div class="text-lg font-bold text-slate-200">{html.escape(str(value))}</div>
+            </div>
+        """
+        for icon, label, value, color in cards
+    )
+
+
+def _lttb(xs, ys, target=_LTTB_TARGET):
+    """
+    Largest-Triangle-Three-Buckets: indices of `target` points of (xs, ys)
+    that keep the visual shape of the line. Always keeps the first and last
+    point; every index is returned when the series already fits.
+    """
+    n = len(xs)
+    if n <= target or target < 3:
+        return np.arange(n)
+    # target - 2 buckets over the inner points [1, n - 1)
+    edges = np.linspace(1, n - 1, target - 1).astype(np.intp)
+    sizes = np.diff(edges)
+    # Average of each bucket; the last bucket looks ahead to the final point
+    next_x = np.append((np.add.reduceat(xs[:-1], edges[:-1]) / sizes)[1:], xs[-1])
+    next_y = np.append((np.add.reduceat(ys[:-1], edges[:-1]) / sizes)[1:], ys[-1])
+
+    out = np.empty(target, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for b in range(target - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = xs[a], ys[a]
+        area = np.abs((ax - next_x[b]) * (ys[lo:hi] - ay) - (ax - xs[lo:hi]) * (next_y[b] - ay))
+        a = lo + int(area.argmax())
+        out[b + 1] = a
+    return out
+
+
+def _downsample_series(series, target=_LTTB_TARGET):
+    """
+    Replace every plotted array longer than `target` by its LTTB downsample,
+    in place. A downsampled metric gets its own x values under
+    entry["x"][key]; stats are left as computed from the raw data.
+    """
+    for entry in series.values():
+        if len(entry["elapsed"]) <= target:
+            continue
+        elapsed = entry["elapsed"]
+        xs_all = np.array(elapsed, dtype=np.float64)
+        entry["x"] = {}
+        for key in _SERIES_KEYS:
+            values = entry[key]
+            ys = np.array(values, dtype=np.float64)  # None -> NaN
+            rows = np.flatnonzero(~np.isnan(ys))
+            # Pick from the original lists so the JSON keeps the sensor values as read
+            rows = rows[_lttb(xs_all[rows], ys[rows], target)].tolist()
+            entry["x"][key] = [elapsed[i] for i in rows]
+            entry[key] = [values[i] for i in rows]
+        # Every plotted key has its own x now; only the run span is kept
+        entry["elapsed"] = [elapsed[0], elapsed[-1]]
+
+
+def _blob(values, tag, dtype):
+    """
+    {tag: base64 of `values` as a little-endian array} (None becomes NaN),
+    or `values` itself when its JSON text is shorter: sensor readings are
+    rounded to a few digits, so e.g. integer temperatures stay smaller as JSON.
+    """
+    blob = base64.b64encode(np.array(values, dtype=dtype).tobytes()).decode("ascii")
+    if len(blob) >= len(json.dumps(values, separators=(",", ":"))):
+        return values
+    return {tag: blob}
+
+
+def _encode_series(series):
+    """
+    Pack the plotted arrays as base64 blobs where that is shorter, in place:
+    Float32 for the metrics, Float64 for the time axes. The page decodes a
+    blob straight into a typed array instead of parsing a JSON number list.
+    """
+    for entry in series.values():
+        for key in _SERIES_KEYS:
+            entry[key] = _blob(entry[key], "_f32", "<f4")
+        entry["elapsed"] = _blob(entry["elapsed"], "_f64", "<f8")
+        for key, xs in entry.get("x", {}).items():
+            entry["x"][key] = _blob(xs, "_f64", "<f8")
+
+
+# Template split at its {{MARKER}}s and UTF-8 encoded once at import:
+# [literal bytes, marker, literal bytes, marker, ..., literal bytes].
+# Writing a report needs no str.replace at all
+_MARKER_RE = re.compile(r"\{\{([A-Z_]+)\}\}")
+
+
+def _split_template(template):
+    parts = _MARKER_RE.split(template)
+    return [part.encode("utf-8") if i % 2 == 0 else part for i, part in enumerate(parts)]
+
+
+_TEMPLATE_PARTS_FULL = _split_template(_HTML_TEMPLATE_FULL)
+_TEMPLATE_PARTS_MINIMAL = _split_template(_HTML_TEMPLATE_MINIMAL)
+
+
+def _write_json(f, data):
+    """Serialize `data` as UTF-8 JSON straight into the binary file `f`."""
+    if orjson is not None:
+        # Series are keyed by GPU index (int keys)
+        f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        for chunk in json.JSONEncoder(ensure_ascii=False).iterencode(data):
+            f.write(chunk.encode("utf-8"))
+
+
+def _strip_unused(report_data, series):
+    """
+    Specialize the page data to this run, in place on `series`: drop the
+    stats of metrics that never had a valid reading and return only what
+    the page script reads (GPU list and series) plus the table rows that
+    can show up. Returns (page_data, table_metrics).
+    """
+    used = set()
+    for entry in series.values():
+        entry["stats"] = {k: v for k, v in entry["stats"].items() if v is not None}
+        used.update(entry["stats"])
+    page_data = {"config": {"gpus": report_data.get("config", {}).get("gpus", [])}, "series": series}
+    return page_data, [m for m in _TABLE_METRICS if m[1] in used]
+
+
+def generate_html_report(report_data, output_path, full_resolution=False, compress=False,
+                         strip_unused=True):
+    """
+    Generate a self-contained HTML report from a report dict. The raw
+    snapshots are not embedded: the page gets the per-GPU series and stats
+    from _pivot_series instead. Series longer than _LTTB_TARGET points are
+    downsampled for the charts (stats still cover every sample) unless
+    full_resolution is True. A report without snapshots uses the minimal
+    template: static header and cards only, no script or chart library.
+    strip_unused embeds only the fields the page reads and the table rows
+    this run has data for; pass False to keep the full report in REPORT.
+    With compress=True the page is written gzipped to `output_path` + ".gz"
+    (e.g. report.html.gz). Returns the path written.
+    """
     cfg = report_data.get("config", {})
     mode = cfg.get("mode", "?")
     ts = report_data.get("test_started", "")[:19].replace("T", " ")
     title = f"{mode} — {ts}"
 
-    json_str = json.dumps(report_data, ensure_ascii=False)
-    html = _HTML_TEMPLATE.replace("{{JSON_DATA}}", json_str).replace("{{TITLE}}", title)
+    snapshots = report_data.get("snapshots", [])
+    if snapshots:
+        template = _TEMPLATE_PARTS_FULL
+        series = _pivot_series(snapshots)
+        if not full_resolution:
+            _downsample_series(series)
+        _encode_series(series)
+        if strip_unused:
+            page_data, table_metrics = _strip_unused(report_data, series)
+        else:
+            page_data = {k: v for k, v in report_data.items() if k != "snapshots"}
+            page_data["series"] = series
+            table_metrics = _TABLE_METRICS
+    else:
+        template, page_data, table_metrics = _TEMPLATE_PARTS_MINIMAL, None, ()
+    # Header, cards and footer are static HTML; the page script only draws the GPU sections
+    fills = {
+        "TITLE": html.escape(title),
+        "HEADER_HTML": _header_html(report_data),
+        "SUMMARY_CARDS_HTML": _summary_cards_html(report_data, len(snapshots)),
+        "FOOTER_DATE": html.escape(_fmt_date(report_data.get("test_started"))),
+        "TABLE_METRICS": json.dumps(table_metrics, ensure_ascii=False),
+    }
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    if compress:
+        if not output_path.endswith(".gz"):
+            output_path += ".gz"
+        out = gzip.open(output_path, "wb", compresslevel=6)
+    else:
+        out = open(output_path, "wb")
+
+    # Written piece by piece: the JSON is never joined into one big page string
+    with out as f:
+        for i, part in enumerate(template):
+            if i % 2 == 0:
+                f.write(part)
+            elif part == "JSON_DATA":
+                _write_json(f, page_data)
+            else:
+                f.write(fills[part].encode("utf-8"))
 
     return output_path